@@ -30,6 +30,8 @@ class UnixDaemonServer:
         self.socket_group = socket_group
         self.server: Optional[asyncio.Server] = None
         self.running = False
+        # Set once the socket is bound and on_startup has completed
+        self.ready = asyncio.Event()
         self.logger = logging.getLogger(self.__class__.__name__)
         self.route_registry = RouteRegistry()
 
@@ -42,7 +44,7 @@ class UnixDaemonServer:
         """Setup signal handlers for graceful shutdown."""
 
         def signal_handler(signum, frame):
-            self.logger.info(f"Received signal {signum}, shutting down")
+            self.logger.info("Received signal %s, shutting down", signum)
             if self.running:
                 asyncio.create_task(self.stop())
 
@@ -51,7 +53,7 @@ class UnixDaemonServer:
 
     async def start(self):
         """Start the daemon server."""
-        self.logger.info(f"Starting {self.__class__.__name__}")
+        self.logger.info("Starting %s", self.__class__.__name__)
 
         try:
             # Ensure socket directory exists
@@ -59,8 +61,7 @@ class UnixDaemonServer:
             socket_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Remove existing socket
-            if socket_path.exists():
-                socket_path.unlink()
+            socket_path.unlink(missing_ok=True)
 
             # Create Unix domain socket server
             self.server = await asyncio.start_unix_server(
@@ -74,14 +75,15 @@ class UnixDaemonServer:
             await self.on_startup()
 
             self.running = True
-            self.logger.info(f"Daemon listening on {socket_path}")
+            self.ready.set()
+            self.logger.info("Daemon listening on %s", socket_path)
 
             # Start serving
             async with self.server:
                 await self.server.serve_forever()
 
         except Exception as e:
-            self.logger.error(f"Failed to start daemon: {e}")
+            self.logger.error("Failed to start daemon: %s", e)
             await self.stop()
             raise
 
@@ -90,8 +92,9 @@ class UnixDaemonServer:
         if not self.running:
             return
 
-        self.logger.info(f"Stopping {self.__class__.__name__}")
+        self.logger.info("Stopping %s", self.__class__.__name__)
         self.running = False
+        self.ready.clear()
 
         try:
             # Call subclass shutdown hook
@@ -103,14 +106,12 @@ class UnixDaemonServer:
                 await self.server.wait_closed()
 
             # Clean up socket
-            socket_path = Path(self.socket_path)
-            if socket_path.exists():
-                socket_path.unlink()
+            Path(self.socket_path).unlink(missing_ok=True)
 
             self.logger.info("Daemon stopped successfully")
 
         except Exception as e:
-            self.logger.error(f"Error during shutdown: {e}")
+            self.logger.error("Error during shutdown: %s", e)
 
     def _set_socket_permissions(self):
         """Set socket file permissions and ownership."""
@@ -126,25 +127,25 @@ class UnixDaemonServer:
                     user_info = pwd.getpwnam(self.socket_owner)
                     uid = user_info.pw_uid
                 except KeyError:
-                    self.logger.warning(f"User '{self.socket_owner}' not found")
+                    self.logger.warning("User '%s' not found", self.socket_owner)
 
             if self.socket_group:
                 try:
                     group_info = grp.getgrnam(self.socket_group)
                     gid = group_info.gr_gid
                 except KeyError:
-                    self.logger.warning(f"Group '{self.socket_group}' not found")
+                    self.logger.warning("Group '%s' not found", self.socket_group)
 
             if uid != -1 or gid != -1:
                 os.chown(self.socket_path, uid, gid)
 
         except Exception as e:
-            self.logger.error(f"Failed to set socket permissions: {e}")
+            self.logger.error("Failed to set socket permissions: %s", e)
 
     async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle client connection."""
         client_addr = writer.get_extra_info("peername", "unknown")
-        self.logger.debug(f"Client connected: {client_addr}")
+        self.logger.debug("Client connected: %s", client_addr)
 
         try:
             while True:
@@ -160,19 +161,19 @@ class UnixDaemonServer:
         except asyncio.IncompleteReadError:
             pass  # Client disconnected
         except Exception as e:
-            self.logger.error(f"Error handling client {client_addr}: {e}")
+            self.logger.error("Error handling client %s: %s", client_addr, e)
         finally:
             try:
                 writer.close()
                 await writer.wait_closed()
             except Exception as ie:
-                self.logger.error(f"Error closing writer for {client_addr}: {ie}")
+                self.logger.error("Error closing writer for %s: %s", client_addr, ie)
                 pass
-            self.logger.debug(f"Client disconnected: {client_addr}")
+            self.logger.debug("Client disconnected: %s", client_addr)
 
     async def _process_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Process incoming message and route to handler."""
-        message_id = message.get("id", str(uuid.uuid4()))
+        message_id = message.get("id") or uuid.uuid4().hex
         command = message.get("command")
         payload = message.get("payload", {})
 
@@ -180,13 +181,13 @@ class UnixDaemonServer:
             if not command:
                 return UDSProtocol.create_response(message_id, error="Command is required")
 
-            # Get handler for command
-            handler = self.route_registry.get_handler(command)
-            if not handler:
+            # Get handler and validator for command
+            resolved = self.route_registry.resolve(command)
+            if not resolved:
                 return UDSProtocol.create_response(message_id, error=f"Unknown command: {command}")
 
             # Validate payload if validator exists
-            validator = self.route_registry.get_validator(command)
+            handler, validator = resolved
             if validator:
                 validator(payload)
 
@@ -196,7 +197,7 @@ class UnixDaemonServer:
             return UDSProtocol.create_response(message_id, payload=result)
 
         except Exception as e:
-            self.logger.error(f"Error processing command {command}: {e}")
+            self.logger.error("Error processing command %s: %s", command, e)
             return UDSProtocol.create_response(message_id, error=str(e))
 
     async def on_startup(self):
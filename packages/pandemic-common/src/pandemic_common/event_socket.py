@@ -0,0 +1,461 @@
+"""Event primitives shared by the core daemon and the event bus daemon."""
+
+import asyncio
+import functools
+import grp
+import itertools
+import logging
+import os
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from socket import SOMAXCONN
+from typing import Any, Dict, List, Optional, Union
+
+from .protocol import LENGTH_PREFIX, decode_message, encode_message
+
+_PACK_LEN = LENGTH_PREFIX.pack
+_NS_PER_SECOND = 1_000_000_000
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if "SC_IOV_MAX" in os.sysconf_names else 1024
+# asyncio defaults to 100, which a burst of infections subscribing at once can overflow
+_LISTEN_BACKLOG = SOMAXCONN
+
+# Event ids are a random per-process prefix plus a counter, the same 32 hex
+# characters as uuid4().hex without a getrandom call per event
+_event_id_prefix = secrets.token_hex(8)
+_event_id_counter = itertools.count()
+
+
+def _reseed_event_ids():
+    """Give a forked child its own id prefix."""
+    global _event_id_prefix, _event_id_counter
+    _event_id_prefix = secrets.token_hex(8)
+    _event_id_counter = itertools.count()
+
+
+os.register_at_fork(after_in_child=_reseed_event_ids)
+
+
+def _next_event_id() -> str:
+    """Generate a process-unique event id."""
+    return f"{_event_id_prefix}{next(_event_id_counter):016x}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _event_prefix(version: str, source: str, event_type: str) -> bytes:
+    """Render the JSON fields shared by every event of a source and type."""
+    fields = {"version": version, "source": source, "type": event_type}
+    return encode_message(fields)[:-1] + b","
+
+
+@dataclass
+class Event:
+    """Event message structure."""
+
+    # Declared by hand; dataclass(slots=True) needs Python 3.10
+    __slots__ = ("eventId", "version", "source", "type", "timestamp", "payload")
+
+    eventId: str
+    version: str
+    source: str
+    type: str
+    timestamp: str
+    payload: Dict[str, Any]
+
+    @classmethod
+    def create(
+        cls, source: str, event_type: str, payload: Dict[str, Any], version: str = "1.0.0"
+    ) -> "Event":
+        """Create a new event with generated ID and timestamp."""
+        return cls(
+            eventId=_next_event_id(),
+            version=version,
+            source=source,
+            type=event_type,
+            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
+            payload=payload,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize event to UTF-8 JSON bytes, ready for framing."""
+        return b"".join(
+            (
+                _event_prefix(self.version, self.source, self.type),
+                b'"eventId":',
+                encode_message(self.eventId),
+                b',"timestamp":',
+                encode_message(self.timestamp),
+                b',"payload":',
+                encode_message(self.payload),
+                b"}",
+            )
+        )
+
+    def to_json(self) -> str:
+        """Serialize event to JSON."""
+        return self.to_bytes().decode("utf-8")
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> "Event":
+        """Deserialize event from JSON text or bytes."""
+        return cls(**decode_message(data))
+
+
+class RateLimiter:
+    """Token bucket rate limiter for event publishing.
+
+    Tokens are kept as integer token-nanoseconds against the monotonic clock,
+    so refills are exact and unaffected by wall clock adjustments.
+    """
+
+    def __init__(self, max_events_per_second: int, burst_size: int):
+        self.max_events_per_second = max_events_per_second
+        self.burst_size = burst_size
+        self._capacity = burst_size * _NS_PER_SECOND
+        self._tokens = self._capacity
+        self._last_ns = time.monotonic_ns()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        return self._tokens / _NS_PER_SECOND
+
+    @property
+    def last_refill(self) -> float:
+        """Monotonic time of the last refill, in seconds."""
+        return self._last_ns / _NS_PER_SECOND
+
+    @last_refill.setter
+    def last_refill(self, value: float):
+        self._last_ns = int(value * _NS_PER_SECOND)
+
+    def reset(self):
+        """Refill the bucket to its full burst size."""
+        self._tokens = self._capacity
+        self._last_ns = time.monotonic_ns()
+
+    def allow_event(self) -> bool:
+        """Check if an event is allowed under rate limit."""
+        now = time.monotonic_ns()
+
+        # Refill tokens based on time elapsed
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last_ns) * self.max_events_per_second
+        )
+        self._last_ns = now
+
+        # Check if we have tokens available
+        if self._tokens >= _NS_PER_SECOND:
+            self._tokens -= _NS_PER_SECOND
+            return True
+
+        return False
+
+
+class SubscriberProtocol(asyncio.Protocol):
+    """Write-only protocol for a single event subscriber connection.
+
+    Subscribers never send data, so the connection is only watched for
+    disconnects and write flow control; no task is held per subscriber.
+    """
+
+    def __init__(self, event_socket: "EventSocket"):
+        self.event_socket = event_socket
+        self.transport: Optional[asyncio.WriteTransport] = None
+        self.fileno = -1
+        self._paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        self.transport = transport
+        # Resolved once so direct writes skip the extra-info lookup per batch
+        self.fileno = transport.get_extra_info("socket").fileno()
+        self.event_socket._add_subscriber(self)
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.event_socket._remove_subscriber(self)
+        self._wake_drain(exc or ConnectionResetError("Subscriber disconnected"))
+
+    def data_received(self, data: bytes):
+        pass
+
+    def eof_received(self) -> bool:
+        return False
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wake_drain(None)
+
+    async def drain(self):
+        """Wait until the transport buffer drops below its high-water mark."""
+        if self.transport.is_closing():
+            raise ConnectionResetError("Subscriber connection is closing")
+
+        if self._paused:
+            self._drain_waiter = asyncio.get_running_loop().create_future()
+            await self._drain_waiter
+
+    def _wake_drain(self, exc: Optional[Exception]):
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is None or waiter.done():
+            return
+        if exc is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(exc)
+
+
+class EventSocket:
+    """Manages a single event socket for publishing/subscribing."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        source_id: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        socket_mode: int = 660,
+        socket_group: str = "pandemic",
+        batch_delay: float = 0.001,
+        socket_gid: Optional[int] = None,
+        dir_fd: Optional[int] = None,
+        backlog: int = _LISTEN_BACKLOG,
+    ):
+        self.socket_path = socket_path
+        self.source_id = source_id
+        self.rate_limiter = rate_limiter
+        self.socket_mode = socket_mode
+        self.socket_group = socket_group
+        self.server: Optional[asyncio.Server] = None
+        self.subscribers: List[SubscriberProtocol] = []
+        self.batch_delay = batch_delay
+        self.socket_gid = socket_gid
+        self.dir_fd = dir_fd
+        self.backlog = backlog
+        self._pending: List[bytes] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(f"{__name__}.{source_id}")
+
+    async def start(self):
+        """Start the event socket server."""
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        try:
+            loop = asyncio.get_running_loop()
+            self.server = await loop.create_unix_server(
+                lambda: SubscriberProtocol(self), path=self.socket_path, backlog=self.backlog
+            )
+
+            # Set socket permissions and group
+            self._set_socket_permissions()
+
+            self.logger.debug(f"Event socket started: {self.socket_path}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to start event socket {self.source_id}: {e}")
+            raise
+
+    def _set_socket_permissions(self):
+        """Set socket file permissions and group ownership.
+
+        Uses the owning manager's cached group id and events directory fd when
+        provided, so creating a source needs no group database lookup.
+        """
+        path = self.socket_path
+        if self.dir_fd is not None:
+            path = os.path.basename(path)
+
+        try:
+            # Set file mode
+            os.chmod(path, int(str(self.socket_mode), 8), dir_fd=self.dir_fd)
+
+            # Set group ownership if group exists
+            try:
+                gid = self.socket_gid
+                if gid is None:
+                    gid = grp.getgrnam(self.socket_group).gr_gid
+                if gid != -1:
+                    os.chown(path, -1, gid, dir_fd=self.dir_fd)
+            except KeyError:
+                self.logger.warning(
+                    f"Group '{self.socket_group}' not found, using default ownership"
+                )
+            except PermissionError:
+                self.logger.warning(f"Cannot change group ownership of {self.socket_path}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to set socket permissions: {e}")
+
+    def close(self):
+        """Stop accepting new subscribers without waiting for shutdown."""
+        if self.server:
+            self.server.close()
+
+    async def stop(self):
+        """Stop the event socket server.
+
+        Pending events are handed to the transports without waiting on drain, so a
+        subscriber that stopped reading cannot hold up shutdown; it is aborted.
+        """
+        self.close()
+
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        frames, self._pending = self._pending, []
+        for subscriber in list(self.subscribers):
+            transport = subscriber.transport
+            if frames and not transport.is_closing():
+                transport.writelines(frames)
+            if subscriber._paused:
+                transport.abort()
+            else:
+                transport.close()
+
+        if self.server:
+            await self.server.wait_closed()
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to remove socket {self.socket_path}: {e}")
+
+        self.logger.debug(f"Event socket stopped: {self.socket_path}")
+
+    async def publish(self, event: Event):
+        """Publish event to all subscribers."""
+        # Apply rate limiting
+        if self.rate_limiter and not self.rate_limiter.allow_event():
+            self.logger.warning(
+                f"Rate limit exceeded for {self.source_id}, dropping event {event.type}"
+            )
+            return
+
+        if not self.subscribers:
+            self.logger.debug(f"No subscribers for {self.source_id}, dropping event {event.type}")
+            return
+
+        try:
+            event_data = event.to_bytes()
+            self._pending.append(_PACK_LEN(len(event_data)) + event_data)
+            self._schedule_flush()
+
+        except Exception as e:
+            self.logger.error(f"Error publishing event {event.type}: {e}")
+
+    async def publish_many(self, events: List[Event]):
+        """Publish a batch of events to all subscribers in one fan-out."""
+        if self.rate_limiter:
+            allowed = [event for event in events if self.rate_limiter.allow_event()]
+            if len(allowed) < len(events):
+                self.logger.warning(
+                    f"Rate limit exceeded for {self.source_id}, "
+                    f"dropping {len(events) - len(allowed)} events"
+                )
+            events = allowed
+
+        if not events:
+            return
+
+        if not self.subscribers:
+            self.logger.debug(f"No subscribers for {self.source_id}, dropping {len(events)} events")
+            return
+
+        try:
+            for event in events:
+                event_data = event.to_bytes()
+                self._pending.append(_PACK_LEN(len(event_data)) + event_data)
+            self._schedule_flush()
+
+        except Exception as e:
+            self.logger.error(f"Error publishing events: {e}")
+
+    def _schedule_flush(self):
+        """Coalesce bursts into a single write per subscriber."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        """Send pending events to all subscribers after the batch delay."""
+        try:
+            while self._pending:
+                await asyncio.sleep(self.batch_delay)
+                frames, self._pending = self._pending, []
+                await self._fanout(frames)
+        finally:
+            self._flush_task = None
+
+    async def _fanout(self, frames: List[bytes]):
+        """Write a batch of frames to every subscriber (best effort)."""
+        waiting = []
+        dead = []
+        for index, subscriber in enumerate(self.subscribers):
+            try:
+                remaining = self._send_direct(subscriber, frames)
+                if remaining:
+                    subscriber.transport.writelines(remaining)
+                    waiting.append(subscriber)
+            except Exception as e:
+                self.logger.debug(f"Failed to send event to subscriber: {e}")
+                dead.append(index)
+
+        # Clean up disconnected subscribers before yielding to the loop
+        for index in reversed(dead):
+            self.subscribers[index].transport.abort()
+            del self.subscribers[index]
+
+        results = await asyncio.gather(
+            *(subscriber.drain() for subscriber in waiting), return_exceptions=True
+        )
+        for subscriber, result in zip(waiting, results):
+            if isinstance(result, Exception):
+                self.logger.debug(f"Failed to send event to subscriber: {result}")
+                self._remove_subscriber(subscriber)
+
+    def _add_subscriber(self, subscriber: SubscriberProtocol):
+        """Register a newly connected subscriber."""
+        self.subscribers.append(subscriber)
+        self.logger.debug(f"New subscriber connected to {self.source_id}")
+
+    def _remove_subscriber(self, subscriber: SubscriberProtocol):
+        """Forget a subscriber if it is still registered."""
+        try:
+            self.subscribers.remove(subscriber)
+        except ValueError:
+            return
+        self.logger.debug(f"Subscriber disconnected from {self.source_id}")
+
+    def _send_direct(self, subscriber: SubscriberProtocol, frames: List[bytes]) -> List[bytes]:
+        """Write frames straight to the subscriber socket, returning what is left unsent.
+
+        Only used while the transport has nothing buffered, so ordering is kept and
+        the kernel gathers the shared frames without a copy per subscriber.
+        """
+        transport = subscriber.transport
+        if transport.get_write_buffer_size() != 0 or transport.is_closing():
+            return frames
+
+        try:
+            sent = os.writev(subscriber.fileno, frames[:_IOV_MAX])
+        except (BlockingIOError, InterruptedError):
+            return frames
+
+        for index, frame in enumerate(frames):
+            if sent < len(frame):
+                return [memoryview(frame)[sent:], *frames[index + 1 :]] if sent else frames[index:]
+            sent -= len(frame)
+        return []
@@ -1,12 +1,32 @@
 """Event client for pandemic infections."""
 
 import asyncio
-import json
+import functools
 import logging
 import re
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 
+from .event_socket import Event
+from .protocol import LENGTH_PREFIX, UDSProtocol
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile glob-style pattern to regex.
+
+    ``*`` matches any characters except ``.`` and ``**`` matches any characters
+    including ``.``. Results are cached since the same patterns are typically
+    shared by many subscribers.
+    """
+    regex_pattern = pattern.replace(".", r"\.")
+    regex_pattern = regex_pattern.replace("**", "DOUBLE_STAR")
+    regex_pattern = regex_pattern.replace("*", "[^.]*")
+    regex_pattern = regex_pattern.replace("DOUBLE_STAR", ".*")
+    regex_pattern = f"^{regex_pattern}$"
+
+    return re.compile(regex_pattern)
+
 
 @dataclass
 class EventSubscription:
@@ -27,8 +47,6 @@ class EventClient:
 
     async def publish(self, event_type: str, payload: Dict[str, Any], version: str = "1.0.0"):
         """Publish an event to this infection's event stream."""
-        from pandemic_core.events import Event
-
         socket_path = f"{self.events_dir}/{self.infection_id}.sock"
 
         try:
@@ -36,11 +54,10 @@ class EventClient:
 
             # Create and serialize event
             event = Event.create(self.infection_id, event_type, payload, version)
-            event_data = event.to_json().encode("utf-8")
-            event_length = len(event_data).to_bytes(4, "big")
+            event_data = event.to_bytes()
 
             # Send event (infections publish by connecting and sending)
-            writer.write(event_length + event_data)
+            writer.write(LENGTH_PREFIX.pack(len(event_data)) + event_data)
             await writer.drain()
 
             writer.close()
@@ -60,8 +77,11 @@ class EventClient:
             self.logger.warning(f"Already subscribed to {subscription_key}")
             return
 
+        # Compile once up front; the subscription loop only matches
+        pattern_regex = compile_pattern(pattern)
+
         # Start subscription task
-        task = asyncio.create_task(self._subscription_loop(source, pattern, handler))
+        task = asyncio.create_task(self._subscription_loop(source, pattern_regex, handler))
         self.subscriptions[subscription_key] = task
 
         self.logger.debug(f"Subscribed to {subscription_key}")
@@ -70,9 +90,9 @@ class EventClient:
         """Unsubscribe from events."""
         subscription_key = f"{source}:{pattern}"
 
-        if subscription_key in self.subscriptions:
-            self.subscriptions[subscription_key].cancel()
-            del self.subscriptions[subscription_key]
+        task = self.subscriptions.pop(subscription_key, None)
+        if task is not None:
+            task.cancel()
             self.logger.debug(f"Unsubscribed from {subscription_key}")
 
     async def close(self):
@@ -87,10 +107,9 @@ class EventClient:
         self.subscriptions.clear()
         self.logger.debug("Closed all subscriptions")
 
-    async def _subscription_loop(self, source: str, pattern: str, handler: Callable):
+    async def _subscription_loop(self, source: str, pattern_regex: re.Pattern, handler: Callable):
         """Main subscription loop for receiving events."""
         socket_path = f"{self.events_dir}/{source}.sock"
-        pattern_regex = self._compile_pattern(pattern)
 
         while True:
             try:
@@ -100,20 +119,17 @@ class EventClient:
                 try:
                     while True:
                         # Read event length
-                        length_data = await reader.readexactly(4)
+                        length_data = await reader.readexactly(LENGTH_PREFIX.size)
                         if not length_data:
                             break
 
-                        event_length = int.from_bytes(length_data, "big")
+                        (event_length,) = LENGTH_PREFIX.unpack(length_data)
 
                         # Read event data
                         event_data = await reader.readexactly(event_length)
-                        event_json = event_data.decode("utf-8")
 
                         # Parse event
-                        from pandemic_core.events import Event
-
-                        event = Event.from_json(event_json)
+                        event = Event.from_json(event_data)
 
                         # Check if event matches pattern
                         if pattern_regex.match(event.type):
@@ -139,16 +155,7 @@ class EventClient:
 
     def _compile_pattern(self, pattern: str) -> re.Pattern:
         """Compile glob-style pattern to regex."""
-        # Convert glob pattern to regex
-        # * matches any characters except .
-        # ** matches any characters including .
-        regex_pattern = pattern.replace(".", r"\.")
-        regex_pattern = regex_pattern.replace("**", "DOUBLE_STAR")
-        regex_pattern = regex_pattern.replace("*", "[^.]*")
-        regex_pattern = regex_pattern.replace("DOUBLE_STAR", ".*")
-        regex_pattern = f"^{regex_pattern}$"
-
-        return re.compile(regex_pattern)
+        return compile_pattern(pattern)
 
 
 class EventManager:
@@ -217,18 +224,9 @@ class EventManager:
                 },
             }
 
-            # Send message
-            message_data = json.dumps(message).encode("utf-8")
-            message_length = len(message_data).to_bytes(4, "big")
-
-            writer.write(message_length + message_data)
-            await writer.drain()
-
-            # Read response
-            length_data = await reader.readexactly(4)
-            response_length = int.from_bytes(length_data, "big")
-            response_data = await reader.readexactly(response_length)
-            response = json.loads(response_data.decode("utf-8"))
+            # Send message and read response as single length-prefixed frames
+            await UDSProtocol.send_message(writer, message)
+            response = await UDSProtocol.receive_message(reader)
 
             writer.close()
             await writer.wait_closed()
@@ -2,8 +2,67 @@
 
 import asyncio
 import json
+import struct
+import time
+import uuid
 from typing import Any, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# Big-endian u32 length prefix in front of every frame
+LENGTH_PREFIX = struct.Struct(">I")
+
+# Copying a prebuilt dict of the same shape is cheaper than a 6-key literal
+_SUCCESS_RESPONSE: Dict[str, Any] = {
+    "id": None,
+    "type": "response",
+    "status": "success",
+    "payload": None,
+    "error": None,
+    "timestamp": None,
+}
+
+_last_ts_tick = -1
+_last_ts = ""
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as ISO 8601, reformatted at most once per ~1ms."""
+    global _last_ts_tick, _last_ts
+
+    tick = time.monotonic_ns() >> 20
+    if tick != _last_ts_tick:
+        now = time.time()
+        micros = int(now * 1_000_000) % 1_000_000
+        _last_ts = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{micros:06d}Z"
+        _last_ts_tick = tick
+    return _last_ts
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Serialize a message to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message)
+        except TypeError:
+            # e.g. non-string keys, which the stdlib encoder coerces
+            pass
+    return json.dumps(message).encode("utf-8")
+
+
+def decode_message(data: bytes) -> Dict[str, Any]:
+    """Parse UTF-8 JSON message bytes, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # e.g. NaN/Infinity literals, which the stdlib decoder accepts
+            pass
+    return json.loads(data)
+
 
 class UDSProtocol:
     """Unix Domain Socket protocol utilities."""
@@ -11,37 +70,36 @@ class UDSProtocol:
     @staticmethod
     async def send_message(writer: asyncio.StreamWriter, message: Dict[str, Any]):
         """Send message over UDS with length prefix."""
-        message_data = json.dumps(message).encode("utf-8")
-        message_length = len(message_data).to_bytes(4, "big")
-
-        writer.write(message_length + message_data)
+        message_data = encode_message(message)
+        writer.write(LENGTH_PREFIX.pack(len(message_data)) + message_data)
         await writer.drain()
 
     @staticmethod
     async def receive_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
         """Receive message from UDS with length prefix."""
+        return decode_message(await UDSProtocol.receive_frame(reader))
+
+    @staticmethod
+    async def receive_frame(reader: asyncio.StreamReader) -> bytes:
+        """Receive the raw bytes of one length-prefixed frame."""
         # Read message length (4 bytes)
-        length_data = await reader.readexactly(4)
-        message_length = int.from_bytes(length_data, "big")
+        length_data = await reader.readexactly(LENGTH_PREFIX.size)
+        (message_length,) = LENGTH_PREFIX.unpack(length_data)
 
         # Read message data
-        message_data = await reader.readexactly(message_length)
-        return json.loads(message_data.decode("utf-8"))
+        return await reader.readexactly(message_length)
 
     @staticmethod
     def create_request(
         command: str, payload: Optional[Dict[str, Any]] = None, message_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a request message."""
-        import uuid
-        from datetime import datetime
-
         return {
             "id": message_id or str(uuid.uuid4()),
             "type": "request",
             "command": command,
             "payload": payload or {},
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _now_iso(),
         }
 
     @staticmethod
@@ -49,13 +107,64 @@ class UDSProtocol:
         message_id: str, payload: Optional[Dict[str, Any]] = None, error: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a response message."""
-        from datetime import datetime
+        response = _SUCCESS_RESPONSE.copy()
+        response["id"] = message_id
+        response["payload"] = payload or {}
+        response["timestamp"] = _now_iso()
+        if error:
+            response["status"] = "error"
+            response["error"] = error
+        return response
 
-        return {
-            "id": message_id,
-            "type": "response",
-            "status": "error" if error else "success",
-            "payload": payload or {},
-            "error": error,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-        }
+
+class UDSClient:
+    """Request/response client that reuses one connection to a daemon socket.
+
+    The connection is opened on the first request and kept for later ones;
+    requests are sent one at a time.
+
+    Example:
+        async with UDSClient("/var/run/pandemic/pandemic.sock") as client:
+            response = await client.request("health")
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "UDSClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def request(
+        self, command: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a request and return the full response message."""
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+
+            try:
+                await UDSProtocol.send_message(
+                    self._writer, UDSProtocol.create_request(command, payload)
+                )
+                return await UDSProtocol.receive_message(self._reader)
+            except BaseException:
+                # Includes cancellation: an unread response would desync the next request
+                self._writer.close()
+                self._reader = self._writer = None
+                raise
+
+    async def close(self):
+        """Close the connection if one is open."""
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
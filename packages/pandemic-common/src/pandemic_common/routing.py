@@ -1,7 +1,6 @@
 """Routing decorator for Unix daemon servers."""
 
-import functools
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 
 def route(command: str, *, validate: Optional[Callable] = None):
@@ -13,15 +12,10 @@ def route(command: str, *, validate: Optional[Callable] = None):
     """
 
     def decorator(func: Callable):
-        # Store routing metadata on the function
+        # Store routing metadata on the function; dispatch calls it directly
         func._route_command = command
         func._route_validate = validate
-
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            return await func(*args, **kwargs)
-
-        return wrapper
+        return func
 
     return decorator
 
@@ -32,6 +26,7 @@ class RouteRegistry:
     def __init__(self):
         self.handlers: Dict[str, Callable] = {}
         self.validators: Dict[str, Optional[Callable]] = {}
+        self.routes: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
 
     def register_routes(self, instance: Any):
         """Register all @route decorated methods from an instance."""
@@ -41,6 +36,11 @@ class RouteRegistry:
                 command = attr._route_command
                 self.handlers[command] = attr
                 self.validators[command] = getattr(attr, "_route_validate", None)
+                self.routes[command] = (attr, self.validators[command])
+
+    def resolve(self, command: str) -> Optional[Tuple[Callable, Optional[Callable]]]:
+        """Get the bound handler and validator for command in a single lookup."""
+        return self.routes.get(command)
 
     def get_handler(self, command: str) -> Optional[Callable]:
         """Get handler for command."""
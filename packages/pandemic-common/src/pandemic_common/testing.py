@@ -0,0 +1,22 @@
+"""Test environment setup shared by the pandemic package test suites."""
+
+import asyncio
+import os
+import tempfile
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional faster event loop
+    uvloop = None
+
+
+def configure_test_environment():
+    """Keep test sockets and state on tmpfs unless TMPDIR says otherwise.
+
+    Async tests run on uvloop when it is installed.
+    """
+    if "TMPDIR" not in os.environ and os.path.isdir("/dev/shm"):
+        tempfile.tempdir = "/dev/shm"
+
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
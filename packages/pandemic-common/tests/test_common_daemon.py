@@ -1,13 +1,15 @@
 """Tests for Unix daemon server abstraction."""
 
 import asyncio
+import json
+import math
 import tempfile
 from pathlib import Path
 from typing import Any, Dict
 
 import pytest
 from pandemic_common import UnixDaemonServer, route
-from pandemic_common.protocol import UDSProtocol
+from pandemic_common.protocol import UDSClient, UDSProtocol, decode_message, encode_message
 
 
 class FakeDaemon(UnixDaemonServer):
@@ -23,6 +25,12 @@ class FakeDaemon(UnixDaemonServer):
         """Echo handler."""
         return {"echo": payload.get("message", "")}
 
+    @route("slow")
+    async def slow(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Handler that answers after a delay."""
+        await asyncio.sleep(0.1)
+        return {"message": "late"}
+
 
 @pytest.mark.asyncio
 async def test_daemon_routing():
@@ -40,7 +48,7 @@ async def test_daemon_routing():
         server_task = asyncio.create_task(daemon.start())
 
         # Wait for server to start
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
             # Connect as client
@@ -80,3 +88,105 @@ async def test_daemon_routing():
                 await server_task
             except asyncio.CancelledError:
                 pass
+
+
+@pytest.mark.asyncio
+async def test_uds_client_reuses_connection():
+    """Test sequential client requests share one connection."""
+
+    class CountingDaemon(FakeDaemon):
+        connections = 0
+
+        async def _handle_client(self, reader, writer):
+            self.connections += 1
+            await super()._handle_client(reader, writer)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        daemon = CountingDaemon(str(Path(tmpdir) / "test.sock"))
+        server_task = asyncio.create_task(daemon.start())
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
+
+        try:
+            async with UDSClient(daemon.socket_path) as client:
+                ping_response = await client.request("ping")
+                echo_response = await client.request("echo", {"message": "hello"})
+
+            assert ping_response["payload"]["message"] == "pong"
+            assert echo_response["payload"]["echo"] == "hello"
+            assert daemon.connections == 1
+        finally:
+            await daemon.stop()
+            server_task.cancel()
+            try:
+                await server_task
+            except asyncio.CancelledError:
+                pass
+
+
+@pytest.mark.asyncio
+async def test_uds_client_cancelled_request_reconnects():
+    """Test a request cancelled before its reply does not leak it to the next request."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        daemon = FakeDaemon(str(Path(tmpdir) / "test.sock"))
+        server_task = asyncio.create_task(daemon.start())
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
+
+        try:
+            async with UDSClient(daemon.socket_path) as client:
+                with pytest.raises(asyncio.TimeoutError):
+                    await asyncio.wait_for(client.request("slow"), timeout=0.02)
+
+                response = await client.request("ping")
+
+            assert response["payload"]["message"] == "pong"
+        finally:
+            await daemon.stop()
+            server_task.cancel()
+            try:
+                await server_task
+            except asyncio.CancelledError:
+                pass
+
+
+def test_route_registry_resolves_bound_handlers():
+    """Test handlers and validators are resolved together from one table."""
+
+    def require_message(payload: Dict[str, Any]):
+        if "message" not in payload:
+            raise ValueError("message is required")
+
+    class ValidatedDaemon(FakeDaemon):
+        @route("shout", validate=require_message)
+        async def shout(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+            return {"echo": payload["message"].upper()}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        daemon = ValidatedDaemon(str(Path(tmpdir) / "test.sock"))
+
+        handler, validator = daemon.route_registry.resolve("shout")
+        assert handler == daemon.shout
+        assert validator is require_message
+
+        handler, validator = daemon.route_registry.resolve("ping")
+        assert handler == daemon.ping
+        assert validator is None
+
+        assert daemon.route_registry.resolve("unknown") is None
+
+
+def test_encode_message_matches_stdlib_json():
+    """Test encoded messages decode identically, including keys orjson rejects."""
+    message = UDSProtocol.create_response("abc", {"name": "é", "count": 3, "items": [None]})
+    assert json.loads(encode_message(message)) == message
+
+    assert json.loads(encode_message({"payload": {1: "one"}})) == {"payload": {"1": "one"}}
+
+
+def test_decode_message_matches_stdlib_json():
+    """Test decoding agrees with the stdlib, including literals orjson rejects."""
+    message = UDSProtocol.create_request("status", {"name": "é", "ratio": 0.5})
+    assert decode_message(encode_message(message)) == message
+
+    assert math.isnan(decode_message(b'{"value": NaN}')["value"])
+    with pytest.raises(ValueError):
+        decode_message(b"not json")
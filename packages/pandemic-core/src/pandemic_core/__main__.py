@@ -87,8 +87,7 @@ async def run():
         return 1
     finally:
         # Clean up PID file
-        if pid_file.exists():
-            pid_file.unlink()
+        pid_file.unlink(missing_ok=True)
 
     return 0
 
@@ -7,6 +7,34 @@ from typing import List, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+
+def _env_bool(value: str) -> bool:
+    """Parse a boolean environment variable."""
+    return value.lower() == "true"
+
+
+# (environment variable, DaemonConfig field, converter) read by from_env
+_ENV_MAP = (
+    ("PANDEMIC_SOCKET_PATH", "socket_path", str),
+    ("PANDEMIC_SOCKET_MODE", "socket_mode", int),
+    ("PANDEMIC_SOCKET_OWNER", "socket_owner", str),
+    ("PANDEMIC_SOCKET_GROUP", "socket_group", str),
+    ("PANDEMIC_PID_FILE", "pid_file", str),
+    ("PANDEMIC_INFECTIONS_DIR", "infections_dir", str),
+    ("PANDEMIC_CONFIG_DIR", "config_dir", str),
+    ("PANDEMIC_STATE_DIR", "state_dir", str),
+    ("PANDEMIC_LOG_LEVEL", "log_level", str),
+    ("PANDEMIC_EVENT_BUS_ENABLED", "event_bus_enabled", _env_bool),
+    ("PANDEMIC_EVENTS_DIR", "events_dir", str),
+    ("PANDEMIC_EVENT_RATE_LIMIT", "event_rate_limit", int),
+    ("PANDEMIC_EVENT_BURST_SIZE", "event_burst_size", int),
+)
+
 
 @dataclass
 class DaemonConfig:
@@ -46,7 +74,7 @@ class DaemonConfig:
 
         try:
             with open(config_file) as f:
-                data = yaml.safe_load(f) or {}
+                data = yaml.load(f, Loader=YamlLoader) or {}
         except Exception as e:
             raise ValueError(f"Failed to load config file {config_path}: {e}")
 
@@ -80,21 +108,14 @@ class DaemonConfig:
 
     @classmethod
     def from_env(cls) -> "DaemonConfig":
-        """Load configuration from environment variables."""
+        """Load configuration from environment variables, defaulting unset ones."""
+        environ = os.environ
         return cls(
-            socket_path=os.getenv("PANDEMIC_SOCKET_PATH", cls.socket_path),
-            socket_mode=int(os.getenv("PANDEMIC_SOCKET_MODE", str(cls.socket_mode))),
-            socket_owner=os.getenv("PANDEMIC_SOCKET_OWNER", cls.socket_owner),
-            socket_group=os.getenv("PANDEMIC_SOCKET_GROUP", cls.socket_group),
-            pid_file=os.getenv("PANDEMIC_PID_FILE", cls.pid_file),
-            infections_dir=os.getenv("PANDEMIC_INFECTIONS_DIR", cls.infections_dir),
-            config_dir=os.getenv("PANDEMIC_CONFIG_DIR", cls.config_dir),
-            state_dir=os.getenv("PANDEMIC_STATE_DIR", cls.state_dir),
-            log_level=os.getenv("PANDEMIC_LOG_LEVEL", cls.log_level),
-            event_bus_enabled=os.getenv("PANDEMIC_EVENT_BUS_ENABLED", "true").lower() == "true",
-            events_dir=os.getenv("PANDEMIC_EVENTS_DIR", cls.events_dir),
-            event_rate_limit=int(os.getenv("PANDEMIC_EVENT_RATE_LIMIT", str(cls.event_rate_limit))),
-            event_burst_size=int(os.getenv("PANDEMIC_EVENT_BURST_SIZE", str(cls.event_burst_size))),
+            **{
+                field: convert(environ[key])
+                for key, field, convert in _ENV_MAP
+                if key in environ
+            }
         )
 
     def validate(self) -> List[str]:
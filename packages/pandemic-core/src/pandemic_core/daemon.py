@@ -1,6 +1,6 @@
 """Refactored core daemon with decoupled event bus."""
 
-import uuid
+import secrets
 from typing import Any, Dict, Optional
 
 from pandemic_common import UnixDaemonServer, route
@@ -11,6 +11,16 @@ from .sources import SourceManager
 from .state import StateManager
 from .systemd import SystemdManager
 
+_GITHUB_PREFIX = "github://"
+
+_SYSTEMD_STATE_MAP = {
+    "active": "running",
+    "inactive": "stopped",
+    "failed": "failed",
+    "activating": "starting",
+    "deactivating": "stopping",
+}
+
 
 class PandemicDaemon(UnixDaemonServer):
     """Core pandemic daemon with decoupled event bus."""
@@ -30,7 +40,9 @@ class PandemicDaemon(UnixDaemonServer):
         self.subscriptions: Dict[str, Dict[str, str]] = {}
 
     async def on_startup(self):
-        """Initialize event client if event bus available."""
+        """Sweep stale install leftovers and initialize event client if available."""
+        self.source_manager.sweep_trash()
+
         if self.config.event_bus_enabled:
             self.event_client = EventClient()
             # Try to connect and publish startup event
@@ -45,6 +57,10 @@ class PandemicDaemon(UnixDaemonServer):
             await self._publish_event("system.stopping", {"daemon": "pandemic-core"})
             await self.event_client.disconnect()
 
+        await self.source_manager.close()
+        await self.systemd_manager.close()
+        self.state_manager.close()
+
     async def _publish_event(self, event_type: str, payload: Dict[str, Any]):
         """Publish event via event client with graceful degradation."""
         if not self.event_client:
@@ -52,9 +68,9 @@ class PandemicDaemon(UnixDaemonServer):
 
         try:
             await self.event_client.publish("core", event_type, payload)
-            self.logger.debug(f"Published event: {event_type}")
+            self.logger.debug("Published event: %s", event_type)
         except Exception as e:
-            self.logger.debug(f"Event publishing failed (event bus unavailable): {e}")
+            self.logger.debug("Event publishing failed (event bus unavailable): %s", e)
 
     @route("health")
     async def handle_health(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -85,18 +101,25 @@ class PandemicDaemon(UnixDaemonServer):
         infection_id = payload.get("infectionId")
 
         if infection_id:
-            infection = self.state_manager.get_infection(infection_id)
-            if not infection:
+            stored = self.state_manager.get_infection(infection_id)
+            if not stored:
                 raise ValueError(f"Infection not found: {infection_id}")
 
+            # Transient fields go on a copy so they never reach the stored record
+            infection = dict(stored)
             service_name = infection.get("serviceName")
             if service_name:
                 systemd_status = await self.systemd_manager.get_service_status(service_name)
+                state = self._map_systemd_state(systemd_status["activeState"])
+                if stored.get("state") != state:
+                    # Keep the state manager's tallies in step without a disk write
+                    self.state_manager.observe_infection_state(infection_id, state)
+                infection["state"] = state
                 infection["systemdStatus"] = systemd_status
-                infection["state"] = self._map_systemd_state(systemd_status["activeState"])
 
-            if infection_id in self.subscriptions:
-                infection["eventSubscriptions"] = self.subscriptions[infection_id]
+            subscriptions = self.subscriptions.get(infection_id)
+            if subscriptions is not None:
+                infection["eventSubscriptions"] = subscriptions
 
             return infection
         else:
@@ -122,16 +145,20 @@ class PandemicDaemon(UnixDaemonServer):
     @route("list")
     async def handle_list(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Handle list infections request."""
-        infections = self.state_manager.list_infections()
         filter_state = payload.get("filter", {}).get("state")
 
+        infections = self.state_manager.list_infections()
         if filter_state:
             infections = [i for i in infections if i.get("state") == filter_state]
+            running_count = len(infections) if filter_state == "running" else 0
+        else:
+            # The state manager keeps per-state tallies, so no need to scan
+            running_count = self.state_manager.get_running_count()
 
         return {
             "infections": infections,
             "totalCount": len(infections),
-            "runningCount": len([i for i in infections if i.get("state") == "running"]),
+            "runningCount": running_count,
         }
 
     @route("install")
@@ -141,7 +168,7 @@ class PandemicDaemon(UnixDaemonServer):
         if not source:
             raise ValueError("Source is required for installation")
 
-        infection_id = f"infection-{str(uuid.uuid4())[:8]}"
+        infection_id = f"infection-{secrets.token_hex(4)}"
         name = payload.get("name") or self._extract_name_from_source(source)
 
         infection = {
@@ -181,7 +208,7 @@ class PandemicDaemon(UnixDaemonServer):
                 try:
                     await self.event_client.create_source(infection_id)
                 except Exception as e:
-                    self.logger.debug(f"Failed to create event source: {e}")
+                    self.logger.debug("Failed to create event source: %s", e)
 
             await self._publish_event(
                 "infection.installed", {"infectionId": infection_id, "name": name}
@@ -221,8 +248,7 @@ class PandemicDaemon(UnixDaemonServer):
             await self.systemd_manager.remove_service(service_name)
             removed_services.append(service_name)
 
-        if infection_id in self.subscriptions:
-            del self.subscriptions[infection_id]
+        self.subscriptions.pop(infection_id, None)
 
         if payload.get("cleanup", True):
             infection_path = f"{self.config.infections_dir}/{infection['name']}"
@@ -278,21 +304,17 @@ class PandemicDaemon(UnixDaemonServer):
 
         return {"status": "stopped", "infectionId": infection_id}
 
-    def _extract_name_from_source(self, source: str) -> str:
+    @staticmethod
+    def _extract_name_from_source(source: str) -> str:
         """Extract infection name from source URL."""
-        if source.startswith("github://"):
-            parts = source.replace("github://", "").split("/")
-            if len(parts) >= 2:
-                return parts[1].split("@")[0]
-        return "unknown"
+        if not source.startswith(_GITHUB_PREFIX):
+            return "unknown"
 
-    def _map_systemd_state(self, active_state: str) -> str:
+        owner, _, path = source[len(_GITHUB_PREFIX) :].partition("/")
+        name = path.split("/", 1)[0].split("@", 1)[0]
+        return name if owner and name else "unknown"
+
+    @staticmethod
+    def _map_systemd_state(active_state: str) -> str:
         """Map systemd active state to infection state."""
-        state_map = {
-            "active": "running",
-            "inactive": "stopped",
-            "failed": "failed",
-            "activating": "starting",
-            "deactivating": "stopping",
-        }
-        return state_map.get(active_state, "unknown")
+        return _SYSTEMD_STATE_MAP.get(active_state, "unknown")
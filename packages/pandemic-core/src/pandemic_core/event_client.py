@@ -1,6 +1,7 @@
 """Event client for communicating with event bus daemon."""
 
 import asyncio
+import itertools
 import logging
 from typing import Any, Dict, Optional
 
@@ -8,7 +9,11 @@ from pandemic_common.protocol import UDSProtocol
 
 
 class EventClient:
-    """Client for publishing events to event bus daemon."""
+    """Client for publishing events to event bus daemon.
+
+    Requests are pipelined over a single connection: each one carries a unique
+    id and a background task matches responses back to the waiting callers.
+    """
 
     def __init__(self, socket_path: str = "/var/run/pandemic/event-bus.sock"):
         self.socket_path = socket_path
@@ -16,6 +21,10 @@ class EventClient:
         self._reader: Optional[asyncio.StreamReader] = None
         self._writer: Optional[asyncio.StreamWriter] = None
         self._connected = False
+        self._lock = asyncio.Lock()
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         """Connect to event bus daemon."""
@@ -25,6 +34,7 @@ class EventClient:
         try:
             self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
             self._connected = True
+            self._reader_task = asyncio.create_task(self._read_responses())
             self.logger.debug("Connected to event bus daemon")
         except Exception as e:
             self.logger.debug(f"Failed to connect to event bus: {e}")
@@ -35,77 +45,93 @@ class EventClient:
         if not self._connected:
             return
 
+        writer = self._writer
+        reader_task = self._reader_task
+        self._reset(ConnectionError("Disconnected from event bus"))
+
+        if reader_task and reader_task is not asyncio.current_task():
+            reader_task.cancel()
+
         try:
-            if self._writer:
-                self._writer.close()
-                await self._writer.wait_closed()
+            if writer:
+                await writer.wait_closed()
         except Exception as e:
             self.logger.debug(f"Error during disconnect: {e}")
-        finally:
-            self._reader = None
-            self._writer = None
-            self._connected = False
+
+    async def flush(self):
+        """Wait for all in-flight requests to be answered."""
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
 
     async def publish(
         self, source_id: str, event_type: str, payload: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Publish event via event bus daemon."""
-        try:
-            await self.connect()
-
-            request = UDSProtocol.create_request(
-                "publish", {"sourceId": source_id, "eventType": event_type, "payload": payload}
-            )
-
-            await UDSProtocol.send_message(self._writer, request)
-            response = await UDSProtocol.receive_message(self._reader)
-
-            if response.get("status") == "error":
-                raise RuntimeError(f"Event publish failed: {response.get('error')}")
-
-            return response.get("payload", {})
-
-        except Exception as e:
-            self.logger.debug(f"Event publish failed: {e}")
-            await self.disconnect()
-            raise
+        return await self._request(
+            "publish",
+            {"sourceId": source_id, "eventType": event_type, "payload": payload},
+            "Event publish",
+        )
 
     async def create_source(self, source_id: str) -> Dict[str, Any]:
         """Create event source via event bus daemon."""
-        try:
-            await self.connect()
+        return await self._request("createSource", {"sourceId": source_id}, "Create source")
 
-            request = UDSProtocol.create_request("createSource", {"sourceId": source_id})
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get event bus statistics."""
+        return await self._request("getStats", {}, "Get stats")
 
-            await UDSProtocol.send_message(self._writer, request)
-            response = await UDSProtocol.receive_message(self._reader)
+    async def _request(self, command: str, payload: Dict[str, Any], action: str) -> Dict[str, Any]:
+        """Send a request and wait for its correlated response payload."""
+        async with self._lock:
+            await self.connect()
 
-            if response.get("status") == "error":
-                raise RuntimeError(f"Create source failed: {response.get('error')}")
+            request_id = str(next(self._request_ids))
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
 
-            return response.get("payload", {})
+            request = UDSProtocol.create_request(command, payload, message_id=request_id)
+            try:
+                await UDSProtocol.send_message(self._writer, request)
+            except (EOFError, OSError) as e:
+                self.logger.debug(f"{action} failed: {e}")
+                # Nobody will await this future; keep disconnect from failing it
+                self._pending.pop(request_id, None)
+                await self.disconnect()
+                raise
 
-        except Exception as e:
-            self.logger.debug(f"Create source failed: {e}")
-            await self.disconnect()
-            raise
+        response = await future
 
-    async def get_stats(self) -> Dict[str, Any]:
-        """Get event bus statistics."""
-        try:
-            await self.connect()
+        if response.get("status") == "error":
+            raise RuntimeError(f"{action} failed: {response.get('error')}")
 
-            request = UDSProtocol.create_request("getStats", {})
+        return response.get("payload", {})
 
-            await UDSProtocol.send_message(self._writer, request)
-            response = await UDSProtocol.receive_message(self._reader)
+    async def _read_responses(self):
+        """Resolve pending requests as their responses arrive."""
+        try:
+            while True:
+                response = await UDSProtocol.receive_message(self._reader)
+                future = self._pending.pop(response.get("id"), None)
+                if future and not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.debug(f"Event bus connection lost: {e}")
+            self._reset(ConnectionError(f"Event bus connection lost: {e}"))
 
-            if response.get("status") == "error":
-                raise RuntimeError(f"Get stats failed: {response.get('error')}")
+    def _reset(self, error: Exception):
+        """Close the connection and fail any requests still waiting on it."""
+        if self._writer:
+            self._writer.close()
 
-            return response.get("payload", {})
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._connected = False
 
-        except Exception as e:
-            self.logger.debug(f"Get stats failed: {e}")
-            await self.disconnect()
-            raise
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
@@ -2,213 +2,12 @@
 
 import asyncio
 import grp
-import json
 import logging
 import os
-import pwd
-import time
-import uuid
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-from weakref import WeakSet
-
-
-@dataclass
-class Event:
-    """Event message structure."""
-
-    eventId: str
-    version: str
-    source: str
-    type: str
-    timestamp: str
-    payload: Dict[str, Any]
-
-    @classmethod
-    def create(
-        cls, source: str, event_type: str, payload: Dict[str, Any], version: str = "1.0.0"
-    ) -> "Event":
-        """Create a new event with generated ID and timestamp."""
-        return cls(
-            eventId=str(uuid.uuid4()),
-            version=version,
-            source=source,
-            type=event_type,
-            timestamp=datetime.now(timezone.utc).isoformat() + "Z",
-            payload=payload,
-        )
-
-    def to_json(self) -> str:
-        """Serialize event to JSON."""
-        return json.dumps(asdict(self))
-
-    @classmethod
-    def from_json(cls, data: str) -> "Event":
-        """Deserialize event from JSON."""
-        return cls(**json.loads(data))
-
-
-class RateLimiter:
-    """Token bucket rate limiter for event publishing."""
-
-    def __init__(self, max_events_per_second: int, burst_size: int):
-        self.max_events_per_second = max_events_per_second
-        self.burst_size = burst_size
-        self.tokens = burst_size
-        self.last_refill = time.time()
-
-    def allow_event(self) -> bool:
-        """Check if an event is allowed under rate limit."""
-        now = time.time()
-
-        # Refill tokens based on time elapsed
-        elapsed = now - self.last_refill
-        tokens_to_add = elapsed * self.max_events_per_second
-        self.tokens = min(self.burst_size, self.tokens + tokens_to_add)
-        self.last_refill = now
-
-        # Check if we have tokens available
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return True
+from typing import Any, Dict, List, Optional, Tuple
 
-        return False
-
-
-class EventSocket:
-    """Manages a single event socket for publishing/subscribing."""
-
-    def __init__(
-        self,
-        socket_path: str,
-        source_id: str,
-        rate_limiter: Optional[RateLimiter] = None,
-        socket_mode: int = 660,
-        socket_group: str = "pandemic",
-    ):
-        self.socket_path = socket_path
-        self.source_id = source_id
-        self.rate_limiter = rate_limiter
-        self.socket_mode = socket_mode
-        self.socket_group = socket_group
-        self.server: Optional[asyncio.Server] = None
-        self.subscribers: WeakSet = WeakSet()
-        self.logger = logging.getLogger(f"{__name__}.{source_id}")
-
-    async def start(self):
-        """Start the event socket server."""
-        socket_path = Path(self.socket_path)
-        socket_path.parent.mkdir(parents=True, exist_ok=True)
-
-        if socket_path.exists():
-            socket_path.unlink()
-
-        try:
-            self.server = await asyncio.start_unix_server(
-                self._handle_subscriber, path=str(socket_path)
-            )
-
-            # Set socket permissions and group
-            self._set_socket_permissions()
-
-            self.logger.debug(f"Event socket started: {socket_path}")
-
-        except Exception as e:
-            self.logger.error(f"Failed to start event socket {self.source_id}: {e}")
-            raise
-
-    def _set_socket_permissions(self):
-        """Set socket file permissions and group ownership."""
-        try:
-            # Set file mode
-            os.chmod(self.socket_path, int(str(self.socket_mode), 8))
-
-            # Set group ownership if group exists
-            try:
-                group_info = grp.getgrnam(self.socket_group)
-                os.chown(self.socket_path, -1, group_info.gr_gid)
-            except KeyError:
-                self.logger.warning(
-                    f"Group '{self.socket_group}' not found, using default ownership"
-                )
-            except PermissionError:
-                self.logger.warning(f"Cannot change group ownership of {self.socket_path}")
-
-        except Exception as e:
-            self.logger.error(f"Failed to set socket permissions: {e}")
-
-    async def stop(self):
-        """Stop the event socket server."""
-        if self.server:
-            self.server.close()
-            await self.server.wait_closed()
-
-        socket_path = Path(self.socket_path)
-        if socket_path.exists():
-            try:
-                socket_path.unlink()
-            except Exception as e:
-                self.logger.error(f"Failed to remove socket {self.socket_path}: {e}")
-
-        self.logger.debug(f"Event socket stopped: {socket_path}")
-
-    async def publish(self, event: Event):
-        """Publish event to all subscribers."""
-        # Apply rate limiting
-        if self.rate_limiter and not self.rate_limiter.allow_event():
-            self.logger.warning(
-                f"Rate limit exceeded for {self.source_id}, dropping event {event.type}"
-            )
-            return
-
-        if not self.subscribers:
-            self.logger.debug(f"No subscribers for {self.source_id}, dropping event {event.type}")
-            return
-
-        try:
-            event_data = event.to_json().encode("utf-8")
-            event_length = len(event_data).to_bytes(4, "big")
-            message = event_length + event_data
-
-            # Send to all subscribers (best effort)
-            disconnected = []
-            for writer in list(self.subscribers):
-                try:
-                    writer.write(message)
-                    await writer.drain()
-                except Exception as e:
-                    self.logger.debug(f"Failed to send event to subscriber: {e}")
-                    disconnected.append(writer)
-
-            # Clean up disconnected subscribers
-            for writer in disconnected:
-                self.subscribers.discard(writer)
-
-        except Exception as e:
-            self.logger.error(f"Error publishing event {event.type}: {e}")
-
-    async def _handle_subscriber(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-        """Handle new subscriber connection."""
-        self.subscribers.add(writer)
-        self.logger.debug(f"New subscriber connected to {self.source_id}")
-
-        try:
-            # Monitor connection without reading data
-            # Subscribers only receive events, they don't send data
-            while not writer.is_closing():
-                await asyncio.sleep(0.1)
-        except Exception as e:
-            self.logger.debug(f"Subscriber error: {e}")
-        finally:
-            self.subscribers.discard(writer)
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception as e:
-                self.logger.warning(f"Failed to close subscriber connection: {e}")
-            self.logger.debug(f"Subscriber disconnected from {self.source_id}")
+from pandemic_common.event_socket import Event, EventSocket, RateLimiter
 
 
 class EventBusManager:
@@ -222,6 +21,7 @@ class EventBusManager:
         socket_mode: int = 660,
         socket_group: str = "pandemic",
         event_mode: int = 770,
+        batch_delay: float = 0.001,
     ):
         self.events_dir = events_dir
         self.rate_limit = rate_limit
@@ -229,8 +29,11 @@ class EventBusManager:
         self.socket_mode = socket_mode
         self.socket_group = socket_group
         self.event_mode = event_mode
+        self.batch_delay = batch_delay
         self.sockets: Dict[str, EventSocket] = {}
         self.logger = logging.getLogger(__name__)
+        self._gid: Optional[int] = None
+        self._events_dirfd: Optional[int] = None
 
     async def start(self):
         """Start the event bus manager."""
@@ -244,13 +47,21 @@ class EventBusManager:
             # Set directory permissions
             os.chmod(self.events_dir, int(str(self.event_mode), 8))
 
-            # Set directory group ownership
+            # Resolve the group once for the directory and every socket
             try:
-                group_info = grp.getgrnam(self.socket_group)
-                os.chown(self.events_dir, -1, group_info.gr_gid)
-            except (KeyError, PermissionError) as e:
+                self._gid = grp.getgrnam(self.socket_group).gr_gid
+            except KeyError as e:
+                self._gid = -1
                 self.logger.warning(f"Cannot set directory group ownership: {e}")
 
+            if self._gid != -1:
+                try:
+                    os.chown(self.events_dir, -1, self._gid)
+                except PermissionError as e:
+                    self.logger.warning(f"Cannot set directory group ownership: {e}")
+
+            self._events_dirfd = os.open(self.events_dir, os.O_RDONLY | os.O_DIRECTORY)
+
         except Exception as e:
             self.logger.error(f"Failed to create events directory: {e}")
             raise
@@ -262,13 +73,29 @@ class EventBusManager:
         """Stop the event bus manager."""
         self.logger.info("Stopping event bus manager")
 
-        # Stop all event sockets
+        # Close every listener up front so the shutdowns proceed in parallel
+        for socket in self.sockets.values():
+            socket.close()
+
         stop_tasks = [socket.stop() for socket in self.sockets.values()]
         if stop_tasks:
             await asyncio.gather(*stop_tasks, return_exceptions=True)
 
         self.sockets.clear()
 
+        if self._events_dirfd is not None:
+            os.close(self._events_dirfd)
+            self._events_dirfd = None
+
+    async def reset(self):
+        """Drop every source socket except core and refill rate limiters."""
+        removed = [source_id for source_id in self.sockets if source_id != "core"]
+        await asyncio.gather(*(self.remove_event_socket(source_id) for source_id in removed))
+
+        for socket in self.sockets.values():
+            if socket.rate_limiter:
+                socket.rate_limiter.reset()
+
     async def create_event_socket(self, source_id: str) -> EventSocket:
         """Create a new event socket for the given source."""
         if source_id in self.sockets:
@@ -282,7 +109,14 @@ class EventBusManager:
             rate_limiter = RateLimiter(self.rate_limit, self.burst_size)
 
         event_socket = EventSocket(
-            socket_path, source_id, rate_limiter, self.socket_mode, self.socket_group
+            socket_path,
+            source_id,
+            rate_limiter,
+            self.socket_mode,
+            self.socket_group,
+            self.batch_delay,
+            socket_gid=self._gid,
+            dir_fd=self._events_dirfd,
         )
 
         try:
@@ -319,6 +153,21 @@ class EventBusManager:
         except Exception as e:
             self.logger.error(f"Failed to publish event {event_type} from {source_id}: {e}")
 
+    async def publish_events(self, source_id: str, events: List[Tuple[str, Dict[str, Any]]]):
+        """Publish a batch of ``(event_type, payload)`` events from the specified source."""
+        if source_id not in self.sockets:
+            self.logger.warning(f"No event socket for source: {source_id}")
+            return
+
+        try:
+            await self.sockets[source_id].publish_many(
+                [Event.create(source_id, event_type, payload) for event_type, payload in events]
+            )
+            self.logger.debug(f"Published {len(events)} events from {source_id}")
+
+        except Exception as e:
+            self.logger.error(f"Failed to publish events from {source_id}: {e}")
+
     def get_socket_path(self, source_id: str) -> Optional[str]:
         """Get the socket path for a source."""
         if source_id in self.sockets:
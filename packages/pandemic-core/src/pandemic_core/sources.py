@@ -1,21 +1,159 @@
 """Installation source handlers for pandemic infections."""
 
 import asyncio
+import fcntl
 import logging
-import tempfile
+import os
+import re
+import secrets
+import shutil
+import stat
+import tarfile
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
-from .config import DaemonConfig
+import aiohttp
+import yaml
+
+from .config import DaemonConfig, YamlLoader
+
+# linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+_DOWNLOAD_CHUNK_SIZE = 1 << 16
+# Retired installations wait here, beside the live trees, until deleted
+_TRASH_DIR = ".trash"
+# github://owner/repo[@ref]
+_GITHUB_SOURCE_RE = re.compile(r"^github://([^/@]+/[^@]+)(?:@(.+))?$")
+
+
+class _BlockingStreamReader:
+    """File-like view of an aiohttp response body for use from a worker thread."""
+
+    def __init__(self, content: aiohttp.StreamReader, loop: asyncio.AbstractEventLoop):
+        self._content = content
+        self._loop = loop
+
+    def read(self, size: int = -1) -> bytes:
+        future = asyncio.run_coroutine_threadsafe(self._content.read(size), self._loop)
+        return future.result()
+
+
+def _strip_first_component(member: tarfile.TarInfo, path: str) -> Optional[tarfile.TarInfo]:
+    """Extraction filter equivalent to ``tar --strip-components=1``."""
+    name = member.name.partition("/")[2]
+    if not name:
+        return None
+
+    linkname = member.linkname
+    if member.islnk():
+        linkname = linkname.partition("/")[2]
+
+    return tarfile.data_filter(member.replace(name=name, linkname=linkname, deep=False), path)
+
+
+def _stream_extract(fileobj, target_dir: Path):
+    """Extract a gzipped tar stream without seeking or a temporary file (blocking)."""
+    target_dir.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(fileobj=fileobj, mode="r|gz", bufsize=_DOWNLOAD_CHUNK_SIZE) as archive:
+        archive.extractall(target_dir, filter=_strip_first_component)
+
+
+def _fast_copy(src, dst):
+    """Copy a file and its metadata, preferring a reflink or an in-kernel copy.
+
+    Tries copy_file_range and then sendfile, and falls back to shutil.copy2
+    when neither works for the pair of files.
+    """
+    try:
+        regular = stat.S_ISREG(os.stat(src).st_mode)
+    except OSError:
+        regular = False
+    if not regular:
+        # Opening a FIFO would block; let copy2 reject special files as it always has
+        return shutil.copy2(src, dst)
+
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            except OSError:
+                try:
+                    _copy_file_range(fsrc.fileno(), fdst.fileno())
+                except OSError:
+                    _sendfile(fsrc.fileno(), fdst.fileno())
+    except OSError:
+        return shutil.copy2(src, dst)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _load_yaml(path: Path) -> Any:
+    """Parse a YAML file (blocking)."""
+    with open(path) as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def _copy_file_range(in_fd: int, out_fd: int):
+    """Copy the whole of in_fd to out_fd without passing through userspace."""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("copy_file_range is not available")
+
+    remaining = os.fstat(in_fd).st_size
+    while remaining > 0:
+        copied = os.copy_file_range(in_fd, out_fd, remaining)
+        if copied == 0:
+            break
+        remaining -= copied
+
+
+def _sendfile(in_fd: int, out_fd: int):
+    """Copy the rest of in_fd to out_fd with sendfile, resuming at out_fd's position."""
+    offset = os.lseek(out_fd, 0, os.SEEK_CUR)
+    size = os.fstat(in_fd).st_size
+    while offset < size:
+        sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+class HttpClient:
+    """Lazily created HTTP session shared by source handlers.
+
+    Keeps TCP/TLS connections pooled across downloads instead of starting a
+    new process and handshake for each one.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session and its pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 
 class SourceHandler(ABC):
     """Abstract base class for infection source handlers."""
 
-    def __init__(self, config: DaemonConfig):
+    # URL prefixes this handler claims, used by SourceManager for dispatch
+    prefixes: Tuple[str, ...] = ()
+
+    def __init__(self, config: DaemonConfig, http_client: Optional[HttpClient] = None):
         self.config = config
+        self.http_client = http_client or HttpClient()
         self.logger = logging.getLogger(__name__)
 
     @abstractmethod
@@ -28,31 +166,65 @@ class SourceHandler(ABC):
         """Validate if this handler can process the given source URL."""
         pass
 
+    async def _download_file(self, url: str, target_path: str):
+        """Stream a URL to disk over the shared HTTP session."""
+        session = await self.http_client.session()
+        try:
+            async with session.get(url, raise_for_status=True) as response:
+                with open(target_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f"Download failed: {e}")
+
+    async def _download_and_extract(self, url: str, target_dir: Path):
+        """Stream a tar.gz URL straight into target directory, stripping the top folder."""
+        session = await self.http_client.session()
+        loop = asyncio.get_running_loop()
+        try:
+            async with session.get(url, raise_for_status=True) as response:
+                stream = _BlockingStreamReader(response.content, loop)
+                await asyncio.to_thread(_stream_extract, stream, target_dir)
+        except aiohttp.ClientError as e:
+            raise RuntimeError(f"Download failed: {e}")
+        except tarfile.TarError as e:
+            raise RuntimeError(f"Extraction failed: {e}")
+
+    async def _extract_archive(self, archive_path: str, target_dir: Path):
+        """Extract a tar.gz file into target directory, stripping the top folder."""
+
+        def extract():
+            with open(archive_path, "rb") as archive:
+                _stream_extract(archive, target_dir)
+
+        try:
+            await asyncio.to_thread(extract)
+        except tarfile.TarError as e:
+            raise RuntimeError(f"Extraction failed: {e}")
+
 
 class GitHubSourceHandler(SourceHandler):
     """Handler for GitHub-based infection sources."""
 
+    prefixes = ("github://",)
+
     def validate_source(self, source_url: str) -> bool:
         """Validate GitHub source URL format."""
-        return source_url.startswith("github://")
+        return _GITHUB_SOURCE_RE.match(source_url) is not None
 
     async def download(self, source_url: str, target_dir: Path) -> Dict[str, Any]:
         """Download from GitHub repository."""
-        # Parse github://user/repo@ref format
-        url_part = source_url.replace("github://", "")
-        if "@" in url_part:
-            repo_path, ref = url_part.split("@", 1)
-        else:
-            repo_path, ref = url_part, "main"
+        match = _GITHUB_SOURCE_RE.match(source_url)
+        if not match:
+            raise ValueError(f"Invalid GitHub source: {source_url}")
+        repo_path, ref = match.group(1), match.group(2) or "main"
 
         github_url = f"https://github.com/{repo_path}/archive/{ref}.tar.gz"
 
-        self.logger.info(f"Downloading from GitHub: {github_url}")
+        self.logger.info("Downloading from GitHub: %s", github_url)
 
         # Download and extract
-        with tempfile.NamedTemporaryFile(suffix=".tar.gz") as tmp_file:
-            await self._download_file(github_url, tmp_file.name)
-            await self._extract_archive(tmp_file.name, target_dir)
+        await self._download_and_extract(github_url, target_dir)
 
         return {
             "source": source_url,
@@ -62,64 +234,28 @@ class GitHubSourceHandler(SourceHandler):
             "downloadUrl": github_url,
         }
 
-    async def _download_file(self, url: str, target_path: str):
-        """Download file using curl."""
-        process = await asyncio.create_subprocess_exec(
-            "curl",
-            "-L",
-            "-o",
-            target_path,
-            url,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Download failed: {stderr.decode()}")
-
-    async def _extract_archive(self, archive_path: str, target_dir: Path):
-        """Extract tar.gz archive."""
-        target_dir.mkdir(parents=True, exist_ok=True)
-
-        process = await asyncio.create_subprocess_exec(
-            "tar",
-            "-xzf",
-            archive_path,
-            "-C",
-            str(target_dir),
-            "--strip-components=1",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Extraction failed: {stderr.decode()}")
-
 
 class HttpSourceHandler(SourceHandler):
     """Handler for HTTP/HTTPS-based infection sources."""
 
+    prefixes = ("http://", "https://")
+
     def validate_source(self, source_url: str) -> bool:
         """Validate HTTP source URL."""
-        parsed = urlparse(source_url)
-        return parsed.scheme in ("http", "https")
+        return source_url.startswith(self.prefixes)
 
     async def download(self, source_url: str, target_dir: Path) -> Dict[str, Any]:
         """Download from HTTP URL."""
         parsed = urlparse(source_url)
         filename = Path(parsed.path).name or "infection.tar.gz"
 
-        self.logger.info(f"Downloading from HTTP: {source_url}")
+        self.logger.info("Downloading from HTTP: %s", source_url)
 
         target_dir.mkdir(parents=True, exist_ok=True)
 
         if filename.endswith((".tar.gz", ".tgz")):
             # Download and extract archive
-            with tempfile.NamedTemporaryFile(suffix=".tar.gz") as tmp_file:
-                await self._download_file(source_url, tmp_file.name)
-                await self._extract_archive(tmp_file.name, target_dir)
+            await self._download_and_extract(source_url, target_dir)
         else:
             # Download single file
             target_file = target_dir / filename
@@ -132,46 +268,15 @@ class HttpSourceHandler(SourceHandler):
             "filename": filename,
         }
 
-    async def _download_file(self, url: str, target_path: str):
-        """Download file using curl."""
-        process = await asyncio.create_subprocess_exec(
-            "curl",
-            "-L",
-            "-o",
-            target_path,
-            url,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Download failed: {stderr.decode()}")
-
-    async def _extract_archive(self, archive_path: str, target_dir: Path):
-        """Extract tar.gz archive."""
-        process = await asyncio.create_subprocess_exec(
-            "tar",
-            "-xzf",
-            archive_path,
-            "-C",
-            str(target_dir),
-            "--strip-components=1",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Extraction failed: {stderr.decode()}")
-
 
 class LocalSourceHandler(SourceHandler):
     """Handler for local filesystem-based infection sources."""
 
+    prefixes = ("file://", "/")
+
     def validate_source(self, source_url: str) -> bool:
         """Validate local source path."""
-        return source_url.startswith("file://") or source_url.startswith("/")
+        return source_url.startswith(self.prefixes)
 
     async def download(self, source_url: str, target_dir: Path) -> Dict[str, Any]:
         """Copy from local filesystem."""
@@ -183,28 +288,20 @@ class LocalSourceHandler(SourceHandler):
         if not source_path.exists():
             raise FileNotFoundError(f"Source path does not exist: {source_path}")
 
-        self.logger.info(f"Copying from local path: {source_path}")
+        self.logger.info("Copying from local path: %s", source_path)
 
         target_dir.mkdir(parents=True, exist_ok=True)
 
         if source_path.is_file():
-            if source_path.suffix in (".tar.gz", ".tgz"):
+            if source_path.name.endswith((".tar.gz", ".tgz")):
                 # Extract archive
                 await self._extract_archive(str(source_path), target_dir)
             else:
                 # Copy single file
-                import shutil
-
-                shutil.copy2(source_path, target_dir / source_path.name)
+                await asyncio.to_thread(_fast_copy, source_path, target_dir / source_path.name)
         else:
             # Copy directory contents
-            import shutil
-
-            for item in source_path.iterdir():
-                if item.is_file():
-                    shutil.copy2(item, target_dir / item.name)
-                else:
-                    shutil.copytree(item, target_dir / item.name)
+            await asyncio.to_thread(self._copy_directory, source_path, target_dir)
 
         return {
             "source": source_url,
@@ -213,22 +310,15 @@ class LocalSourceHandler(SourceHandler):
             "isDirectory": source_path.is_dir(),
         }
 
-    async def _extract_archive(self, archive_path: str, target_dir: Path):
-        """Extract tar.gz archive."""
-        process = await asyncio.create_subprocess_exec(
-            "tar",
-            "-xzf",
-            archive_path,
-            "-C",
-            str(target_dir),
-            "--strip-components=1",
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            raise RuntimeError(f"Extraction failed: {stderr.decode()}")
+    def _copy_directory(self, source_path: Path, target_dir: Path):
+        """Copy directory contents into target directory (blocking)."""
+        # DirEntry type checks use d_type from getdents, avoiding a stat per entry
+        with os.scandir(source_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    shutil.copytree(entry.path, target_dir / entry.name, copy_function=_fast_copy)
+                else:
+                    _fast_copy(entry.path, target_dir / entry.name)
 
 
 class SourceManager:
@@ -237,12 +327,61 @@ class SourceManager:
     def __init__(self, config: DaemonConfig):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.http_client = HttpClient()
+        self._cleanup_tasks: Set[asyncio.Task] = set()
+        self._allowed_prefixes: Tuple[str, ...] = tuple(config.allowed_sources or ())
         self.handlers = [
-            GitHubSourceHandler(config),
-            HttpSourceHandler(config),
-            LocalSourceHandler(config),
+            GitHubSourceHandler(config, self.http_client),
+            HttpSourceHandler(config, self.http_client),
+            LocalSourceHandler(config, self.http_client),
         ]
 
+    @property
+    def handlers(self) -> List[SourceHandler]:
+        """Registered source handlers."""
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: List[SourceHandler]):
+        # Longest prefix first so more specific handlers win
+        self._handlers = handlers
+        self._prefix_map: List[Tuple[str, SourceHandler]] = sorted(
+            ((prefix, handler) for handler in handlers for prefix in handler.prefixes),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    async def close(self):
+        """Release pooled download connections and finish pending cleanups."""
+        await self.http_client.close()
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+
+    def sweep_trash(self):
+        """Delete leftover directories from interrupted replacements in the background."""
+        try:
+            with os.scandir(Path(self.config.infections_dir) / _TRASH_DIR) as entries:
+                trash = [Path(e.path) for e in entries]
+        except FileNotFoundError:
+            return
+
+        for path in trash:
+            self._discard(path)
+
+    def _retire(self, target_dir: Path):
+        """Move an existing installation aside and delete it off the install path."""
+        trash_dir = target_dir.parent / _TRASH_DIR
+        trash_dir.mkdir(exist_ok=True)
+        trash = trash_dir / f"{target_dir.name}-{secrets.token_hex(4)}"
+        target_dir.rename(trash)
+        self._discard(trash)
+
+    def _discard(self, path: Path):
+        """Remove a directory tree in a worker thread without awaiting it."""
+        task = asyncio.create_task(asyncio.to_thread(shutil.rmtree, path, ignore_errors=True))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
     async def install_from_source(self, source_url: str, infection_name: str) -> Dict[str, Any]:
         """Install infection from source URL."""
         # Find appropriate handler
@@ -257,9 +396,7 @@ class SourceManager:
         # Create target directory
         target_dir = Path(self.config.infections_dir) / infection_name
         if target_dir.exists():
-            import shutil
-
-            shutil.rmtree(target_dir)
+            self._retire(target_dir)
 
         # Download and install
         download_info = await handler.download(source_url, target_dir)
@@ -275,22 +412,19 @@ class SourceManager:
 
     def _get_handler(self, source_url: str) -> Optional[SourceHandler]:
         """Get appropriate handler for source URL."""
-        for handler in self.handlers:
-            if handler.validate_source(source_url):
-                return handler
+        for prefix, handler in self._prefix_map:
+            if source_url.startswith(prefix):
+                return handler if handler.validate_source(source_url) else None
         return None
 
     def _validate_source_security(self, source_url: str):
         """Validate source against security policies."""
-        if not self.config.allowed_sources:
+        if not self._allowed_prefixes:
             return  # No restrictions
 
         # Check if source matches allowed patterns
-        for allowed in self.config.allowed_sources:
-            if source_url.startswith(allowed):
-                return
-
-        raise SecurityError(f"Source not allowed: {source_url}")
+        if not source_url.startswith(self._allowed_prefixes):
+            raise SecurityError(f"Source not allowed: {source_url}")
 
     async def _load_infection_config(self, infection_dir: Path) -> Dict[str, Any]:
         """Load infection configuration from directory."""
@@ -303,12 +437,7 @@ class SourceManager:
             }
 
         # Load YAML config
-        import yaml
-
-        with open(config_file) as f:
-            config = yaml.safe_load(f)
-
-        return config
+        return await asyncio.to_thread(_load_yaml, config_file)
 
 
 class SecurityError(Exception):
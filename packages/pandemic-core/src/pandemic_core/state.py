@@ -1,67 +1,321 @@
 """State management for pandemic daemon."""
 
-import json
+import asyncio
+import collections
+import hashlib
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import orjson
 
 from .config import DaemonConfig
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional streaming parser
+    ijson = None
+
+# Failed background saves are retried on their own, backing off between attempts
+_RETRY_DELAY_MIN = 0.1
+_RETRY_DELAY_MAX = 30.0
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize state compactly to UTF-8 JSON bytes."""
+    return orjson.dumps(data)
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    """Parse serialized state."""
+    return orjson.loads(data)
+
 
 class StateManager:
-    """Manages daemon and infection state."""
+    """Manages daemon and infection state.
+
+    Each infection is persisted to its own ``infections/<id>.json`` file so a
+    mutation only rewrites that infection. ``manifest.json`` records the ids in
+    insertion order. A legacy single ``state.json`` is migrated on load.
+    """
 
-    def __init__(self, config: DaemonConfig):
+    def __init__(self, config: DaemonConfig, save_delay: float = 0.05):
         self.config = config
         self.logger = logging.getLogger(__name__)
-        self.state_file = Path(config.state_dir) / "state.json"
+        self.state_dir = Path(config.state_dir)
+        self.state_file = self.state_dir / "state.json"
+        self.infections_dir = self.state_dir / "infections"
+        self.manifest_file = self.state_dir / "manifest.json"
+        self.save_delay = save_delay
         self._infections: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        # Infection ids whose shard must be rewritten (or deleted) on the next save
+        self._dirty_ids: Set[str] = set()
+        self._manifest_dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._retry_delay = _RETRY_DELAY_MIN
+        # Disk writes run here, one at a time, so the event loop never blocks on fsync
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pandemic-state")
+        # State each infection was last counted under, so counts stay balanced
+        self._counted: Dict[str, str] = {}
+        self._state_counts: collections.Counter = collections.Counter()
         self._load_state()
+        for infection_id, infection in self._infections.items():
+            self._count(infection_id, infection.get("state", "unknown"))
 
     def _load_state(self):
         """Load state from disk."""
         try:
-            if self.state_file.exists():
-                with open(self.state_file) as f:
-                    data = json.load(f)
-                    self._infections = data.get("infections", {})
+            if self.manifest_file.exists():
+                self._load_shards()
                 self.logger.info(f"Loaded state with {len(self._infections)} infections")
+            elif self.state_file.exists():
+                self._infections = self._read_infections(self.state_file)
+                self._migrate_legacy_state()
+                self.logger.info(f"Migrated state with {len(self._infections)} infections")
             else:
                 self.logger.info("No existing state file, starting fresh")
         except Exception as e:
             self.logger.error(f"Failed to load state: {e}")
             self._infections = {}
 
-    def _save_state(self):
-        """Save state to disk."""
+    def _load_shards(self):
+        """Load per-infection files in manifest order."""
+        ids = _loads(self.manifest_file.read_bytes())
+
+        # Shards written after the last manifest update are picked up too
+        listed = set(ids)
+        unlisted = sorted(
+            path.stem for path in self.infections_dir.glob("*.json") if path.stem not in listed
+        )
+        if unlisted:
+            ids.extend(unlisted)
+            self._manifest_dirty = True
+
+        for infection_id in ids:
+            try:
+                self._infections[infection_id] = _loads(
+                    self._shard_path(infection_id).read_bytes()
+                )
+            except FileNotFoundError:
+                # Removed after the last manifest update
+                self._manifest_dirty = True
+
+        if self._manifest_dirty:
+            self._dirty = True
+            self.flush()
+
+    def _migrate_legacy_state(self):
+        """Rewrite a single state.json as per-infection files."""
+        self._dirty_ids.update(self._infections)
+        self._manifest_dirty = True
+        self._dirty = True
+        self.flush()
+        if not self._dirty_ids and not self._manifest_dirty:
+            self.state_file.unlink()
+
+    def _shard_path(self, infection_id: str) -> Path:
+        """Path of the file holding a single infection."""
+        if not infection_id or infection_id in (".", "..") or "/" in infection_id:
+            raise ValueError(f"Invalid infection id: {infection_id!r}")
+        return self.infections_dir / f"{infection_id}.json"
+
+    @staticmethod
+    def _read_infections(path: Path) -> Dict[str, Dict[str, Any]]:
+        """Read the infections mapping from a state file.
+
+        With ijson installed entries are streamed one at a time, so the raw
+        document is never held in memory alongside the parsed one.
+        """
+        if ijson is not None:
+            with open(path, "rb") as f:
+                return dict(ijson.kvitems(f, "infections", use_float=True))
+        return _loads(path.read_bytes()).get("infections", {})
+
+    def _snapshot(self) -> Tuple[Dict[str, Optional[bytes]], Optional[bytes]]:
+        """Serialize pending changes and clear the dirty markers.
+
+        Shards map to None when the infection was removed. The manifest is
+        None when it does not need rewriting.
+        """
+        shards = {}
+        for infection_id in self._dirty_ids:
+            infection = self._infections.get(infection_id)
+            shards[infection_id] = None if infection is None else _dumps(infection)
+        manifest = _dumps(list(self._infections)) if self._manifest_dirty else None
+
+        self._dirty = False
+        self._dirty_ids = set()
+        self._manifest_dirty = False
+        return shards, manifest
+
+    def _save_state(
+        self, shards: Dict[str, Optional[bytes]], manifest: Optional[bytes]
+    ) -> Tuple[Set[str], bool]:
+        """Write a snapshot to disk, returning the shard ids and manifest that failed."""
+        failed: Set[str] = set(shards)
+        manifest_failed = manifest is not None
         try:
-            # Ensure state directory exists
-            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            self.infections_dir.mkdir(parents=True, exist_ok=True)
 
-            state_data = {"infections": self._infections}
+            for infection_id, data in shards.items():
+                try:
+                    path = self._shard_path(infection_id)
+                except ValueError as e:
+                    # Retrying cannot fix a bad id; don't let it hold back the rest
+                    self.logger.error(f"Skipping shard: {e}")
+                    failed.discard(infection_id)
+                    continue
+                if data is None:
+                    try:
+                        path.unlink()
+                    except FileNotFoundError:
+                        pass
+                elif not self._write_atomic(path, data):
+                    continue
+                failed.discard(infection_id)
 
-            # Write to temporary file first, then rename for atomicity
-            temp_file = self.state_file.with_suffix(".tmp")
-            with open(temp_file, "w") as f:
-                json.dump(state_data, f, indent=2)
+            # Only list ids once every shard has landed
+            if manifest is not None and not failed:
+                manifest_failed = not self._write_atomic(self.manifest_file, manifest)
 
-            temp_file.rename(self.state_file)
+            # Persist renames and unlinks, not just file contents
+            for directory in (self.infections_dir, self.state_dir):
+                dir_fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
             self.logger.debug("State saved successfully")
 
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
 
+        return failed, manifest_failed
+
+    def _write_atomic(self, path: Path, data: bytes) -> bool:
+        """Write a file via a verified temporary file and rename."""
+        expected = hashlib.sha256(data).digest()
+
+        # Write to a fresh temporary file first, then rename for atomicity
+        temp_file = path.with_suffix(".tmp")
+        try:
+            temp_file.unlink()
+        except FileNotFoundError:
+            pass
+
+        fd = os.open(temp_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        with open(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Never replace a good file with bytes that did not land intact
+        if hashlib.sha256(temp_file.read_bytes()).digest() != expected:
+            temp_file.unlink()
+            self.logger.error(f"Write corruption detected for {path.name}, keeping previous copy")
+            return False
+
+        os.replace(temp_file, path)
+        return True
+
+    def _schedule_save(self, delay: Optional[float] = None):
+        """Mark state dirty and coalesce writes from a burst of mutations."""
+        self._dirty = True
+        if self._save_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer to, persist immediately
+            self.flush()
+            return
+
+        self._save_handle = loop.call_later(
+            self.save_delay if delay is None else delay, self._save_in_background
+        )
+
+    def _save_in_background(self):
+        """Hand pending changes to the writer thread without blocking the loop."""
+        self._save_handle = None
+        if not self._dirty:
+            return
+
+        future = asyncio.get_running_loop().run_in_executor(
+            self._writer, self._save_state, *self._snapshot()
+        )
+        future.add_done_callback(self._on_saved)
+
+    def _on_saved(self, future: asyncio.Future):
+        """Requeue whatever a background save could not write and retry it."""
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        failed, manifest_failed = future.result()
+        self._requeue(failed, manifest_failed)
+        if failed or manifest_failed:
+            # No later mutation may come along to trigger the retry
+            self._schedule_save(self._retry_delay)
+            self._retry_delay = min(self._retry_delay * 2, _RETRY_DELAY_MAX)
+        else:
+            self._retry_delay = _RETRY_DELAY_MIN
+
+    def _requeue(self, failed: Set[str], manifest_failed: bool):
+        """Mark failed writes dirty again so the next save picks them up."""
+        self._dirty_ids |= failed
+        self._manifest_dirty |= manifest_failed
+        if failed or manifest_failed:
+            self._dirty = True
+
+    def flush(self):
+        """Write pending state changes to disk now.
+
+        Runs on the writer thread so it is ordered after any background save.
+        """
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+        if self._dirty:
+            self._requeue(*self._writer.submit(self._save_state, *self._snapshot()).result())
+
+    def close(self):
+        """Flush pending changes and stop the writer thread."""
+        self.flush()
+        self._writer.shutdown(wait=True)
+
+    def _count(self, infection_id: str, state: Optional[str]):
+        """Move an infection between state tallies; None drops it."""
+        previous = self._counted.pop(infection_id, None)
+        if previous is not None:
+            self._state_counts[previous] -= 1
+        if state is not None:
+            self._counted[infection_id] = state
+            self._state_counts[state] += 1
+
     def add_infection(self, infection_id: str, infection_data: Dict[str, Any]):
         """Add or update infection."""
+        # Reject ids that cannot name a shard before they reach a save
+        self._shard_path(infection_id)
+        if infection_id not in self._infections:
+            self._manifest_dirty = True
         self._infections[infection_id] = infection_data
-        self._save_state()
+        self._count(infection_id, infection_data.get("state", "unknown"))
+        self._dirty_ids.add(infection_id)
+        self._schedule_save()
         self.logger.info(f"Added infection: {infection_id}")
 
     def remove_infection(self, infection_id: str) -> bool:
         """Remove infection."""
         if infection_id in self._infections:
             del self._infections[infection_id]
-            self._save_state()
+            self._count(infection_id, None)
+            self._dirty_ids.add(infection_id)
+            self._manifest_dirty = True
+            self._schedule_save()
             self.logger.info(f"Removed infection: {infection_id}")
             return True
         return False
@@ -78,13 +332,22 @@ class StateManager:
         """Update infection state."""
         if infection_id in self._infections:
             self._infections[infection_id]["state"] = state
-            self._save_state()
+            self._count(infection_id, state)
+            self._dirty_ids.add(infection_id)
+            self._schedule_save()
             self.logger.debug(f"Updated infection {infection_id} state to {state}")
 
+    def observe_infection_state(self, infection_id: str, state: str):
+        """Record a state read back from systemd in memory only, without a save."""
+        infection = self._infections.get(infection_id)
+        if infection is not None:
+            infection["state"] = state
+            self._count(infection_id, state)
+
     def get_infection_count(self) -> int:
         """Get total infection count."""
         return len(self._infections)
 
     def get_running_count(self) -> int:
         """Get count of running infections."""
-        return len([i for i in self._infections.values() if i.get("state") == "running"])
+        return self._state_counts["running"]
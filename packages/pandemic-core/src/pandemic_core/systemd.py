@@ -1,11 +1,43 @@
 """Systemd integration for pandemic infections."""
 
+import asyncio
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Tuple
 
 from .config import DaemonConfig
 from .systemd_client import SystemdHelperClient
 
+# Seconds a fetched status is reused, and how long idle entries are kept
+_STATUS_TTL = 0.5
+_STATUS_EVICT_AFTER = 5.0
+
+_MEMORY_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+# Indexed by syslog priority
+_SYSLOG_LEVELS = ("EMERG", "ALERT", "CRIT", "ERROR", "WARN", "NOTICE", "INFO", "DEBUG")
+
+_SERVICE_TEMPLATE = """[Unit]
+Description=Pandemic Infection: %i
+After=pandemic-core.service
+Requires=pandemic-core.service
+PartOf=pandemic-core.service
+
+[Service]
+Type=simple
+User={user}
+Group=pandemic
+WorkingDirectory=/opt/pandemic/infections/%i
+ExecStart={command}
+Restart=always
+RestartSec=5
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=pandemic.target
+"""
+
 
 class SystemdManager:
     """Manages systemd services for infections."""
@@ -14,100 +46,152 @@ class SystemdManager:
         self.config = config
         self.logger = logging.getLogger(__name__)
         self.helper_client = SystemdHelperClient()
+        self._status_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._status_locks: Dict[str, asyncio.Lock] = {}
+        self._status_swept = time.monotonic()
+
+    async def close(self):
+        """Close the connection to the systemd helper."""
+        await self.helper_client.close()
 
     async def create_service(self, infection_id: str, infection_data: Dict[str, Any]) -> str:
         """Create systemd service for infection."""
         service_name = f"pandemic-infection@{infection_data['name']}.service"
 
-        try:
-            await self.helper_client.connect()
+        # Generate template and override config
+        template_content = self._generate_service_template(
+            config_data=infection_data.get("configInfo", {})
+        )
+        override_config = self._generate_override_config(infection_data)
 
-            # Generate template and override config
-            template_content = self._generate_service_template(
-                config_data=infection_data.get("configInfo", {})
-            )
-            override_config = self._generate_override_config(infection_data)
+        # Create service via helper
+        await self.helper_client.create_service(
+            service_name, template_content, override_config, infection_id
+        )
 
-            # Create service via helper
-            await self.helper_client.create_service(
-                service_name, template_content, override_config, infection_id
-            )
-
-            self.logger.info(f"Created systemd service: {service_name}")
-            return service_name
-
-        finally:
-            await self.helper_client.disconnect()
+        self.logger.info(f"Created systemd service: {service_name}")
+        return service_name
 
     async def remove_service(self, service_name: str):
         """Remove systemd service."""
-        try:
-            await self.helper_client.connect()
-            await self.helper_client.remove_service(service_name)
-            self.logger.info(f"Removed systemd service: {service_name}")
-        finally:
-            await self.helper_client.disconnect()
+        await self.helper_client.remove_service(service_name)
+        self.invalidate_status(service_name)
+        self.logger.info(f"Removed systemd service: {service_name}")
 
     async def start_service(self, service_name: str):
         """Start systemd service."""
-        try:
-            await self.helper_client.connect()
-            await self.helper_client.start_service(service_name)
-            self.logger.info(f"Started service: {service_name}")
-        finally:
-            await self.helper_client.disconnect()
+        await self.helper_client.start_service(service_name)
+        self.invalidate_status(service_name)
+        self.logger.info(f"Started service: {service_name}")
 
     async def stop_service(self, service_name: str):
         """Stop systemd service."""
-        try:
-            await self.helper_client.connect()
-            await self.helper_client.stop_service(service_name)
-            self.logger.info(f"Stopped service: {service_name}")
-        finally:
-            await self.helper_client.disconnect()
+        await self.helper_client.stop_service(service_name)
+        self.invalidate_status(service_name)
+        self.logger.info(f"Stopped service: {service_name}")
 
     async def restart_service(self, service_name: str):
         """Restart systemd service."""
-        await self.stop_service(service_name)
-        await self.start_service(service_name)
+        await self.helper_client.restart_service(service_name)
+        self.invalidate_status(service_name)
         self.logger.info(f"Restarted service: {service_name}")
 
-    async def get_service_status(self, service_name: str) -> Dict[str, Any]:
-        """Get systemd service status."""
-        try:
-            await self.helper_client.connect()
-            response = await self.helper_client.get_status(service_name)
-
-            return {
-                "activeState": response.get("activeState", "unknown"),
-                "subState": response.get("subState", "unknown"),
-                "pid": response.get("pid"),
-                "memoryUsage": self._format_memory(response.get("memoryUsage", "0")),
-                "cpuUsage": "0%",  # TODO: Calculate from helper response
-                "uptime": "0s",  # TODO: Calculate uptime
-            }
+    async def start_services(self, service_names: List[str]) -> Dict[str, str]:
+        """Start several services in one helper request, returning failures by name."""
+        return await self._batch_service_op("start", service_names)
 
-        except Exception as e:
-            self.logger.error(f"Failed to get service status for {service_name}: {e}")
-            return {
-                "activeState": "unknown",
-                "subState": "unknown",
-                "pid": None,
-                "memoryUsage": "0B",
-                "cpuUsage": "0%",
-                "uptime": "0s",
-            }
-        finally:
-            await self.helper_client.disconnect()
+    async def stop_services(self, service_names: List[str]) -> Dict[str, str]:
+        """Stop several services in one helper request, returning failures by name."""
+        return await self._batch_service_op("stop", service_names)
+
+    async def _batch_service_op(self, operation: str, service_names: List[str]) -> Dict[str, str]:
+        """Run a batched helper operation and invalidate the affected statuses."""
+        if not service_names:
+            return {}
+
+        response = await self.helper_client.batch_service_op(operation, service_names)
+        for service_name in service_names:
+            self.invalidate_status(service_name)
+
+        failed = response.get("payload", {}).get("failed", {})
+        self.logger.info(
+            f"Batch {operation}: {len(service_names) - len(failed)} succeeded, {len(failed)} failed"
+        )
+        return failed
+
+    def invalidate_status(self, service_name: str):
+        """Drop any cached status so the next lookup hits systemd."""
+        self._status_cache.pop(service_name, None)
+
+    async def get_service_status(self, service_name: str) -> Dict[str, Any]:
+        """Get systemd service status, reusing a result fetched within the last TTL.
+
+        Concurrent callers for the same service wait on a single lookup.
+        """
+        cached = self._status_cache.get(service_name)
+        if cached and time.monotonic() - cached[0] < _STATUS_TTL:
+            return cached[1]
+
+        lock = self._status_locks.setdefault(service_name, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the entry while we waited
+            cached = self._status_cache.get(service_name)
+            now = time.monotonic()
+            if cached and now - cached[0] < _STATUS_TTL:
+                return cached[1]
+
+            try:
+                status = await self._fetch_service_status(service_name)
+            except Exception as e:
+                self.logger.error(f"Failed to get service status for {service_name}: {e}")
+                return {
+                    "activeState": "unknown",
+                    "subState": "unknown",
+                    "pid": None,
+                    "memoryUsage": "0B",
+                    "cpuUsage": "0%",
+                    "uptime": "0s",
+                }
+
+            self._status_cache[service_name] = (time.monotonic(), status)
+
+        if now - self._status_swept > _STATUS_EVICT_AFTER:
+            self._evict_statuses(now)
+
+        return status
+
+    def _evict_statuses(self, now: float):
+        """Forget statuses and locks for services that are no longer polled."""
+        self._status_swept = now
+        for name, (fetched, _) in list(self._status_cache.items()):
+            if now - fetched > _STATUS_EVICT_AFTER:
+                del self._status_cache[name]
+        for name, lock in list(self._status_locks.items()):
+            if name not in self._status_cache and not lock.locked():
+                del self._status_locks[name]
+
+    async def _fetch_service_status(self, service_name: str) -> Dict[str, Any]:
+        """Query the helper for a service's current status."""
+        response = await self.helper_client.get_status(service_name)
+        status = response.get("payload", {})
+        uptime_seconds = status.get("uptimeSeconds", 0)
+
+        return {
+            "activeState": status.get("activeState", "unknown"),
+            "subState": status.get("subState", "unknown"),
+            "pid": status.get("pid"),
+            "memoryUsage": self._format_memory(status.get("memoryUsage", "0")),
+            "cpuUsage": self._format_cpu(status.get("cpuUsageNSec", "0"), uptime_seconds),
+            "uptime": self._format_uptime(uptime_seconds),
+        }
 
     async def get_service_logs(self, service_name: str, lines: int = 100) -> list:
         """Get service logs from journald."""
         try:
-            await self.helper_client.connect()
             response = await self.helper_client.get_logs(service_name, lines)
 
             logs = []
-            for log_entry in response.get("logs", []):
+            for log_entry in response.get("payload", {}).get("logs", []):
                 logs.append(
                     {
                         "timestamp": log_entry.get("timestamp", ""),
@@ -122,53 +206,34 @@ class SystemdManager:
         except Exception as e:
             self.logger.error(f"Failed to get logs for {service_name}: {e}")
             return []
-        finally:
-            await self.helper_client.disconnect()
 
     def _generate_service_template(self, config_data: Dict[str, Any]) -> str:
         """Generate systemd service template content."""
         systemd = config_data.get("systemd", {})
         execution = config_data.get("execution", {})
-        return f"""[Unit]
-Description=Pandemic Infection: %i
-After=pandemic-core.service
-Requires=pandemic-core.service
-PartOf=pandemic-core.service
-
-[Service]
-Type=simple
-User={systemd.get("user", "pandemic-%i")}
-Group=pandemic
-WorkingDirectory=/opt/pandemic/infections/%i
-ExecStart={execution.get("command", "/opt/pandemic/infections/%i/bin/%i")}
-Restart=always
-RestartSec=5
-StandardOutput=journal
-StandardError=journal
-
-[Install]
-WantedBy=pandemic.target
-"""
+        return _SERVICE_TEMPLATE.format(
+            user=systemd.get("user", "pandemic-%i"),
+            command=execution.get("command", "/opt/pandemic/infections/%i/bin/%i"),
+        )
 
     def _generate_override_config(self, infection_data: Dict[str, Any]) -> str:
         """Generate systemd override configuration."""
-        config_lines = ["[Service]"]
-
         # Add environment variables
         env_vars = infection_data.get("environment", {})
         env_vars["PANDEMIC_SOCKET"] = self.config.socket_path
 
-        for key, value in env_vars.items():
-            config_lines.append(f'Environment="{key}={value}"')
+        config = "[Service]\n" + "".join(
+            f'Environment="{key}={value}"\n' for key, value in env_vars.items()
+        )
 
         # Add resource limits
         resources = infection_data.get("resources", {})
         if "memoryLimit" in resources:
-            config_lines.append(f"MemoryLimit={resources['memoryLimit']}")
+            config += f"MemoryLimit={resources['memoryLimit']}\n"
         if "cpuQuota" in resources:
-            config_lines.append(f"CPUQuota={resources['cpuQuota']}")
+            config += f"CPUQuota={resources['cpuQuota']}\n"
 
-        return "\n".join(config_lines) + "\n"
+        return config
 
     def _format_memory(self, memory_bytes: str) -> str:
         """Format memory usage."""
@@ -177,31 +242,35 @@ WantedBy=pandemic.target
             if bytes_val == 0:
                 return "0B"
 
-            for unit in ["B", "KB", "MB", "GB"]:
-                if bytes_val < 1024:
-                    return f"{bytes_val:.1f}{unit}"
-                bytes_val = int(bytes_val / 1024)
-
-            return f"{bytes_val:.1f}TB"
+            # Each unit is 2**10 of the previous one
+            index = min((bytes_val.bit_length() - 1) // 10, len(_MEMORY_UNITS) - 1)
+            return f"{bytes_val / (1 << (10 * index)):.1f}{_MEMORY_UNITS[index]}"
         except Exception as e:
             self.logger.error(f"Failed to format memory: {e}")
             return "0B"
 
-    def _format_cpu(self, cpu_nsec: str) -> str:
-        """Format CPU usage."""
-        # TODO: Calculate actual CPU percentage
-        return "0%"
+    def _format_cpu(self, cpu_nsec: str, uptime_seconds: int) -> str:
+        """Format CPU usage as the average percentage since the service started."""
+        try:
+            if not uptime_seconds:
+                return "0%"
+            return f"{int(cpu_nsec) / (uptime_seconds * 10_000_000):.1f}%"
+        except ValueError:
+            # CPUUsageNSec is "[not set]" when CPU accounting is disabled
+            return "0%"
+
+    def _format_uptime(self, uptime_seconds: int) -> str:
+        """Format uptime."""
+        hours, remainder = divmod(int(uptime_seconds), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        if hours:
+            return f"{hours}h {minutes}m"
+        if minutes:
+            return f"{minutes}m {seconds}s"
+        return f"{seconds}s"
 
     def _map_syslog_level(self, priority: str) -> str:
         """Map syslog priority to log level."""
-        level_map = {
-            "0": "EMERG",
-            "1": "ALERT",
-            "2": "CRIT",
-            "3": "ERROR",
-            "4": "WARN",
-            "5": "NOTICE",
-            "6": "INFO",
-            "7": "DEBUG",
-        }
-        return level_map.get(priority, "INFO")
+        if len(priority) == 1 and "0" <= priority <= "7":
+            return _SYSLOG_LEVELS[int(priority)]
+        return "INFO"
@@ -2,22 +2,30 @@
 
 import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pandemic_common.protocol import UDSProtocol
 
 
 class SystemdHelperClient:
-    """Client for privileged systemd helper daemon."""
+    """Client for privileged systemd helper daemon.
+
+    A single connection is kept open and reused across requests; it is
+    re-established transparently if the helper drops it.
+    """
 
     def __init__(self, socket_path: str = "/var/run/pandemic/systemd-helper.sock"):
         self.socket_path = socket_path
         self.logger = logging.getLogger(__name__)
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
 
     async def connect(self):
-        """Connect to helper daemon."""
+        """Connect to helper daemon if not already connected."""
+        if self.writer and not self.writer.is_closing() and not self.reader.at_eof():
+            return
+
         try:
             self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path)
             self.logger.debug("Connected to systemd helper")
@@ -37,6 +45,17 @@ class SystemdHelperClient:
                 self.reader = None
                 self.writer = None
 
+    async def close(self):
+        """Close the persistent helper connection."""
+        await self.disconnect()
+
+    def _drop(self):
+        """Abandon the connection without waiting, e.g. while being cancelled."""
+        if self.writer:
+            self.writer.close()
+        self.reader = None
+        self.writer = None
+
     async def create_service(
         self,
         service_name: str,
@@ -71,6 +90,11 @@ class SystemdHelperClient:
         request = {"command": "stopService", "payload": {"serviceName": service_name}}
         return await self._send_request(request)
 
+    async def restart_service(self, service_name: str) -> Dict[str, Any]:
+        """Restart systemd service."""
+        request = {"command": "restartService", "payload": {"serviceName": service_name}}
+        return await self._send_request(request)
+
     async def enable_service(self, service_name: str) -> Dict[str, Any]:
         """Enable systemd service."""
         request = {"command": "enableService", "payload": {"serviceName": service_name}}
@@ -91,23 +115,68 @@ class SystemdHelperClient:
         request = {"command": "getLogs", "payload": {"serviceName": service_name, "lines": lines}}
         return await self._send_request(request)
 
-    async def _send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Send request to helper daemon."""
-        if not self.writer or not self.reader:
-            raise RuntimeError("Not connected to systemd helper")
+    async def batch_service_op(self, operation: str, service_names: List[str]) -> Dict[str, Any]:
+        """Apply start/stop/restart/enable/disable to several services in one request."""
+        request = {
+            "command": "batchServices",
+            "payload": {"operation": operation, "serviceNames": service_names},
+        }
+        return await self._send_request(request)
 
-        try:
-            # Send request using UDS protocol
-            await UDSProtocol.send_message(self.writer, request)
+    async def batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pipeline several requests and return their responses in order.
 
-            # Read response using UDS protocol
-            response = await UDSProtocol.receive_message(self.reader)
+        Every request is written before any response is read, so the whole
+        batch costs a single round trip. Error responses are returned as-is.
+        """
+        async with self._lock:
+            await self.connect()
+            try:
+                for request in requests:
+                    await UDSProtocol.send_message(self.writer, request)
 
-            if response.get("status") == "error":
-                raise RuntimeError(f"Helper error: {response.get('error')}")
+                return [await UDSProtocol.receive_message(self.reader) for _ in requests]
+            except BaseException:
+                # A partial batch leaves responses unaccounted for
+                self._drop()
+                raise
 
-            return response
+    async def _send_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send request to helper daemon, reconnecting once if the connection went stale.
+
+        Only a failed send is retried; once the request is written the helper may
+        have acted on it, so it is never sent twice.
+        """
+        async with self._lock:
+            for attempt in range(2):
+                await self.connect()
+                try:
+                    # Send request using UDS protocol
+                    await UDSProtocol.send_message(self.writer, request)
+                    break
+                except (ConnectionError, OSError) as e:
+                    self._drop()
+                    if attempt:
+                        self.logger.error(f"Request failed: {e}")
+                        raise
+                    self.logger.debug(f"Helper connection lost, reconnecting: {e}")
+                except BaseException:
+                    self._drop()
+                    raise
 
-        except Exception as e:
-            self.logger.error(f"Request failed: {e}")
-            raise
+            try:
+                # Read response using UDS protocol
+                response = await UDSProtocol.receive_message(self.reader)
+            except Exception as e:
+                self._drop()
+                self.logger.error(f"Request failed: {e}")
+                raise
+            except BaseException:
+                # An unread response would be handed to the next request
+                self._drop()
+                raise
+
+        if response.get("status") == "error":
+            raise RuntimeError(f"Helper error: {response.get('error')}")
+
+        return response
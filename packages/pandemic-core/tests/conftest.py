@@ -1,15 +1,23 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
+import shutil
 import tempfile
+import time
 from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock
+from typing import Any, Dict, List, Tuple
 
 import pytest
+from pandemic_common.testing import configure_test_environment
 from pandemic_core.config import DaemonConfig
 from pandemic_core.state import StateManager
 
 
+def pytest_configure(config):
+    """Apply the test environment shared by all pandemic packages."""
+    configure_test_environment()
+
+
 @pytest.fixture
 def temp_dir():
     """Temporary directory fixture."""
@@ -17,6 +25,25 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def shm_base():
+    """Session-wide scratch root, on tmpfs when available."""
+    base = Path(tempfile.mkdtemp(prefix="pandemic-tests-"))
+    yield base
+    shutil.rmtree(base, ignore_errors=True)
+
+
+@pytest.fixture
+def temp_events_dir(shm_base):
+    """Per-test events directory under the session scratch root.
+
+    Names stay short so socket paths fit within the AF_UNIX limit.
+    """
+    events_dir = tempfile.mkdtemp(dir=shm_base)
+    yield events_dir
+    shutil.rmtree(events_dir, ignore_errors=True)
+
+
 @pytest.fixture
 def test_config(temp_dir):
     """Test daemon configuration."""
@@ -32,49 +59,63 @@ def test_config(temp_dir):
 
 
 @pytest.fixture
-def state_manager(test_config):
-    """State manager fixture."""
-    return StateManager(test_config)
+def wait_for_subscribers():
+    """Wait until an event socket has accepted the given number of subscribers."""
+
+    async def wait(socket, count: int, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while len(socket.subscribers) < count:
+            assert time.monotonic() < deadline, "Subscribers did not connect in time"
+            await asyncio.sleep(0.005)
+
+    return wait
+
+
+class FakeSourceManager:
+    """Stand-in for SourceManager that records installs and returns a fixed result."""
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+        self.calls: List[Tuple[str, str]] = []
+
+    async def install_from_source(self, source_url: str, infection_name: str) -> Dict[str, Any]:
+        self.calls.append((source_url, infection_name))
+        return self.result
+
+    def sweep_trash(self):
+        pass
+
+    async def close(self):
+        pass
 
 
 @pytest.fixture
-def mock_systemd_manager():
-    """Mock systemd manager."""
-    mock = MagicMock()
-    mock.create_service = AsyncMock(return_value="test-service.service")
-    mock.remove_service = AsyncMock()
-    mock.start_service = AsyncMock()
-    mock.stop_service = AsyncMock()
-    mock.restart_service = AsyncMock()
-    mock.get_service_status = AsyncMock(
-        return_value={
-            "activeState": "active",
-            "subState": "running",
-            "pid": 12345,
-            "memoryUsage": "64MB",
-            "cpuUsage": "5%",
-            "uptime": "1h 30m",
+def fake_source_manager():
+    """Source manager stub returning a canned installation result."""
+    return FakeSourceManager(
+        {
+            "installationPath": "/opt/pandemic/infections/test-infection",
+            "downloadInfo": {"source": "github://test/repo@v1.0.0", "type": "github"},
+            "configInfo": {"metadata": {"name": "test-infection"}},
         }
     )
-    mock.get_service_logs = AsyncMock(return_value=[])
-    return mock
 
 
 @pytest.fixture
-def daemon(test_config):
-    """Refactored daemon fixture with mocked systemd."""
-    from pandemic_core.daemon import PandemicDaemon
+def state_manager(test_config):
+    """State manager fixture."""
+    manager = StateManager(test_config)
+    yield manager
+    # Flush before the temp dir goes so no deferred save recreates it
+    manager.close()
 
-    daemon = PandemicDaemon(test_config)
 
-    # Mock systemd manager to avoid system calls
-    daemon.systemd_manager.create_service = AsyncMock(return_value="test.service")
-    daemon.systemd_manager.remove_service = AsyncMock()
-    daemon.systemd_manager.start_service = AsyncMock()
-    daemon.systemd_manager.stop_service = AsyncMock()
-    daemon.systemd_manager.restart_service = AsyncMock()
-    daemon.systemd_manager.get_service_status = AsyncMock(
-        return_value={
+class FakeSystemdManager:
+    """Stand-in for SystemdManager that records calls instead of touching systemd."""
+
+    def __init__(self, service_name: str = "test.service"):
+        self.service_name = service_name
+        self.status = {
             "activeState": "active",
             "subState": "running",
             "pid": 12345,
@@ -82,15 +123,45 @@ def daemon(test_config):
             "cpuUsage": "5%",
             "uptime": "1h",
         }
-    )
-    daemon.systemd_manager.get_service_logs = AsyncMock(return_value=[])
+        self.calls: List[Tuple[str, tuple]] = []
+
+    async def create_service(self, infection_id: str, infection_data: Dict[str, Any]) -> str:
+        self.calls.append(("create_service", (infection_id, infection_data)))
+        return self.service_name
+
+    async def remove_service(self, service_name: str):
+        self.calls.append(("remove_service", (service_name,)))
+
+    async def start_service(self, service_name: str):
+        self.calls.append(("start_service", (service_name,)))
 
-    return daemon
+    async def stop_service(self, service_name: str):
+        self.calls.append(("stop_service", (service_name,)))
+
+    async def restart_service(self, service_name: str):
+        self.calls.append(("restart_service", (service_name,)))
+
+    async def get_service_status(self, service_name: str) -> Dict[str, Any]:
+        self.calls.append(("get_service_status", (service_name,)))
+        return dict(self.status)
+
+    async def get_service_logs(self, service_name: str, lines: int = 100) -> List[Dict[str, Any]]:
+        self.calls.append(("get_service_logs", (service_name, lines)))
+        return []
+
+    async def close(self):
+        pass
 
 
 @pytest.fixture
-def event_loop():
-    """Event loop fixture for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+def daemon(test_config):
+    """Refactored daemon fixture with a recording systemd manager."""
+    from pandemic_core.daemon import PandemicDaemon
+
+    daemon = PandemicDaemon(test_config)
+
+    # Avoid system calls; handlers only see the calls they make
+    daemon.systemd_manager = FakeSystemdManager()
+
+    yield daemon
+    daemon.state_manager.close()
@@ -28,7 +28,7 @@ class TestDaemonConfig:
         }
 
         with open(config_file, "w") as f:
-            yaml.dump(config_data, f)
+            yaml.dump(config_data, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
 
         config = DaemonConfig.from_file(str(config_file))
 
@@ -50,6 +50,8 @@ class TestDaemonConfig:
             "PANDEMIC_SOCKET_PATH": "/tmp/env.sock",
             "PANDEMIC_LOG_LEVEL": "WARN",
             "PANDEMIC_INFECTIONS_DIR": "/tmp/env/infections",
+            "PANDEMIC_EVENT_RATE_LIMIT": "25",
+            "PANDEMIC_EVENT_BUS_ENABLED": "False",
         }
 
         # Temporarily set environment variables
@@ -64,6 +66,9 @@ class TestDaemonConfig:
             assert config.socket_path == "/tmp/env.sock"
             assert config.log_level == "WARN"
             assert config.infections_dir == "/tmp/env/infections"
+            assert config.event_rate_limit == 25
+            assert config.event_bus_enabled is False
+            assert config.state_dir == DaemonConfig.state_dir
         finally:
             # Restore original environment
             for key, value in original_env.items():
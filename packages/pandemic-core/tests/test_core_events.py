@@ -6,9 +6,11 @@ import os
 import sys
 import tempfile
 import time
-from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
+from pandemic_common.protocol import UDSProtocol
 from pandemic_core.events import Event, EventBusManager, EventSocket, RateLimiter
 
 
@@ -25,6 +27,7 @@ class TestEvent:
         assert event.payload == {"key": "value"}
         assert event.eventId is not None
         assert event.timestamp is not None
+        assert not hasattr(event, "__dict__")
 
     def test_event_serialization(self):
         """Test event JSON serialization."""
@@ -41,6 +44,31 @@ class TestEvent:
         assert event2.type == event.type
         assert event2.payload == event.payload
 
+    def test_event_ids_are_unique(self):
+        """Test generated event ids are distinct 32 character hex strings."""
+        ids = {Event.create("test-source", "test.event", {}).eventId for _ in range(1000)}
+
+        assert len(ids) == 1000
+        assert all(len(event_id) == 32 and int(event_id, 16) >= 0 for event_id in ids)
+
+    def test_event_serialization_escapes_cached_fields(self):
+        """Test cached source/type fields are valid JSON for awkward names."""
+        event = Event.create('source "quoted"', "type\\slash", {"nested": ["é", None]})
+
+        parsed = json.loads(event.to_json())
+        assert parsed["source"] == 'source "quoted"'
+        assert parsed["type"] == "type\\slash"
+        assert parsed["payload"] == {"nested": ["é", None]}
+        assert Event.from_json(event.to_json()) == event
+
+    def test_event_bytes_round_trip(self):
+        """Test the framing bytes match the JSON text and parse back directly."""
+        event = Event.create("test-source", "test.event", {"key": "é", "n": [1, 2.5]})
+
+        data = event.to_bytes()
+        assert data == event.to_json().encode("utf-8")
+        assert Event.from_json(data) == event
+
     def test_event_with_custom_version(self):
         """Test event with custom version."""
         event = Event.create("test-source", "test.event", {}, version="2.0.0")
@@ -74,6 +102,24 @@ class TestRateLimiter:
         time.sleep(0.15)
         assert limiter.allow_event() is True
 
+    def test_rate_limiter_refill_is_exact(self):
+        """Test exactly one token's worth of elapsed time yields one event."""
+        limiter = RateLimiter(10, 1)
+        assert limiter.allow_event() is True
+
+        limiter.last_refill -= 0.1
+        assert limiter.allow_event() is True
+        assert limiter.allow_event() is False
+
+    def test_rate_limiter_reset_refills_burst(self):
+        """Test reset restores the full burst."""
+        limiter = RateLimiter(1, 3)
+        while limiter.allow_event():
+            pass
+
+        limiter.reset()
+        assert [limiter.allow_event() for _ in range(4)] == [True, True, True, False]
+
 
 class TestEventSocket:
     """Test EventSocket class."""
@@ -91,12 +137,12 @@ class TestEventSocket:
 
         # Start socket
         await socket.start()
-        assert Path(temp_socket_path).exists()
+        assert os.access(temp_socket_path, os.F_OK)
         assert socket.server is not None
 
         # Stop socket
         await socket.stop()
-        assert not Path(temp_socket_path).exists()
+        assert not os.access(temp_socket_path, os.F_OK)
         assert not socket.server.is_serving()
 
     @pytest.mark.asyncio
@@ -132,95 +178,207 @@ class TestEventSocket:
         finally:
             await socket.stop()
 
+    @pytest.mark.asyncio
+    async def test_event_socket_batches_burst(self, temp_socket_path):
+        """Test a burst of events is flushed in a single write per subscriber."""
+        socket = EventSocket(temp_socket_path, "test-source")
+        subscriber = MagicMock()
+        subscriber.drain = AsyncMock()
+        subscriber.transport.is_closing.return_value = False
+        socket.subscribers = [subscriber]
 
-class TestEventBusManager:
-    """Test EventBusManager class."""
+        for i in range(3):
+            await socket.publish(Event.create("test-source", "burst.event", {"id": i}))
 
-    @pytest.fixture
-    def temp_events_dir(self):
-        """Create temporary events directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
+        # Let the batch delay elapse so the flush task does the fan-out
+        await socket._flush_task
+        subscriber.drain.assert_awaited_once()
+        await socket.stop()
 
-    @pytest.mark.asyncio
-    async def test_event_bus_manager_lifecycle(self, temp_events_dir):
-        """Test event bus manager start/stop."""
-        manager = EventBusManager(temp_events_dir)
+        subscriber.transport.writelines.assert_called_once()
+        frames = subscriber.transport.writelines.call_args[0][0]
+        assert [json.loads(frame[4:])["payload"]["id"] for frame in frames] == [0, 1, 2]
 
-        await manager.start()
-        assert "core" in manager.sockets
-        assert Path(temp_events_dir).exists()
+    @pytest.mark.asyncio
+    async def test_event_socket_publish_many(self, temp_socket_path):
+        """Test a published batch is rate limited per event and written once."""
+        socket = EventSocket(temp_socket_path, "test-source", RateLimiter(10, 2))
+        subscriber = MagicMock()
+        subscriber.drain = AsyncMock()
+        subscriber.transport.is_closing.return_value = False
+        socket.subscribers = [subscriber]
+
+        await socket.publish_many(
+            [Event.create("test-source", "batch.event", {"id": i}) for i in range(3)]
+        )
+        await socket._flush_task
+        subscriber.drain.assert_awaited_once()
+        await socket.stop()
 
-        await manager.stop()
-        assert len(manager.sockets) == 0
+        subscriber.transport.writelines.assert_called_once()
+        frames = subscriber.transport.writelines.call_args[0][0]
+        assert [json.loads(frame[4:])["payload"]["id"] for frame in frames] == [0, 1]
 
     @pytest.mark.asyncio
-    async def test_create_remove_event_socket(self, temp_events_dir):
-        """Test creating and removing event sockets."""
-        manager = EventBusManager(temp_events_dir)
-        await manager.start()
+    async def test_event_socket_partial_writes_keep_frames_intact(
+        self, temp_socket_path, wait_for_subscribers, monkeypatch
+    ):
+        """Test frames split by a full socket buffer still arrive whole and in order."""
+        writes = []
+        real_writev = os.writev
 
-        try:
-            # Create infection socket
-            socket = await manager.create_event_socket("infection-123")
-            assert "infection-123" in manager.sockets
-            assert socket.source_id == "infection-123"
+        def writev(fd, buffers):
+            sent = real_writev(fd, buffers)
+            writes.append((sent, sum(len(buffer) for buffer in buffers)))
+            return sent
+
+        monkeypatch.setattr(os, "writev", writev)
 
-            # Remove infection socket
-            await manager.remove_event_socket("infection-123")
-            assert "infection-123" not in manager.sockets
+        socket = EventSocket(temp_socket_path, "test-source")
+        await socket.start()
+        reader, writer = await asyncio.open_unix_connection(temp_socket_path)
 
+        try:
+            await wait_for_subscribers(socket, 1)
+
+            # Batches far larger than the socket buffer while nobody reads
+            data = "x" * 10000
+            num_events = 400
+            for i in range(num_events):
+                event = Event.create("test-source", "bulk.event", {"id": i, "data": data})
+                await socket.publish(event)
+                if i % 50 == 49:
+                    await asyncio.sleep(socket.batch_delay * 2)
+
+            events = [
+                json.loads(await asyncio.wait_for(UDSProtocol.receive_frame(reader), timeout=2.0))
+                for _ in range(num_events)
+            ]
+
+            assert any(0 < sent < total for sent, total in writes)
+            assert [event["payload"]["id"] for event in events] == list(range(num_events))
+            assert all(event["payload"]["data"] == data for event in events)
         finally:
-            await manager.stop()
+            writer.close()
+            await socket.stop()
 
     @pytest.mark.asyncio
-    async def test_publish_event(self, temp_events_dir):
-        """Test publishing events."""
-        manager = EventBusManager(temp_events_dir)
-        await manager.start()
+    async def test_event_socket_stop_with_stalled_subscriber(self, temp_socket_path):
+        """Test a subscriber that never reads does not block stop."""
+        socket = EventSocket(temp_socket_path, "test-source")
+        await socket.start()
 
+        reader, writer = await asyncio.open_unix_connection(temp_socket_path)
         try:
-            # Publish to core socket
-            await manager.publish_event("core", "test.event", {"key": "value"})
+            while not socket.subscribers:
+                await asyncio.sleep(0.005)
 
-            # Publish to non-existent socket (should log warning)
-            await manager.publish_event("non-existent", "test.event", {})
+            payload = {"data": "x" * 65536}
+            while not socket.subscribers[0]._paused:
+                await socket.publish(Event.create("test-source", "bulk.event", payload))
+                await asyncio.sleep(socket.batch_delay * 2)
 
+            await asyncio.wait_for(socket.stop(), timeout=2.0)
+            assert not socket.server.is_serving()
         finally:
-            await manager.stop()
+            writer.close()
 
     @pytest.mark.asyncio
-    async def test_get_stats(self, temp_events_dir):
-        """Test getting event bus statistics."""
-        manager = EventBusManager(temp_events_dir, rate_limit=50, burst_size=100)
-        await manager.start()
+    async def test_event_socket_tracks_disconnects(self, temp_socket_path):
+        """Test subscribers are dropped when their connection closes."""
+        socket = EventSocket(temp_socket_path, "test-source")
+        await socket.start()
 
         try:
-            await manager.create_event_socket("infection-123")
+            reader, writer = await asyncio.open_unix_connection(temp_socket_path)
+            await asyncio.sleep(0.05)
+            assert len(socket.subscribers) == 1
+
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)
+            assert len(socket.subscribers) == 0
+        finally:
+            await socket.stop()
 
-            stats = manager.get_stats()
-            assert stats["totalSources"] == 2  # core + infection-123
-            assert "core" in stats["sources"]
-            assert "infection-123" in stats["sources"]
-            assert stats["rateLimit"] == 50
-            assert stats["burstSize"] == 100
 
-        finally:
-            await manager.stop()
+@pytest_asyncio.fixture(scope="class", loop_scope="class")
+async def shared_manager():
+    """One started manager per test class, so sockets are bound only once."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = EventBusManager(temp_dir, rate_limit=50, burst_size=100)
+        await manager.start()
+        yield manager
+        await manager.stop()
+
+
+@pytest_asyncio.fixture(loop_scope="class")
+async def manager(shared_manager):
+    """Shared manager, reset to just the core socket after each test."""
+    yield shared_manager
+    await shared_manager.reset()
+
+
+@pytest.mark.asyncio(loop_scope="class")
+class TestEventBusManager:
+    """Test EventBusManager class."""
+
+    async def test_event_bus_manager_lifecycle(self, tmp_path):
+        """Test event bus manager start/stop."""
+        manager = EventBusManager(str(tmp_path))
+
+        await manager.start()
+        assert "core" in manager.sockets
+        assert tmp_path.exists()
+
+        await manager.stop()
+        assert len(manager.sockets) == 0
+
+    async def test_create_remove_event_socket(self, manager):
+        """Test creating and removing event sockets."""
+        # Create infection socket
+        socket = await manager.create_event_socket("infection-123")
+        assert "infection-123" in manager.sockets
+        assert socket.source_id == "infection-123"
+
+        # Remove infection socket
+        await manager.remove_event_socket("infection-123")
+        assert "infection-123" not in manager.sockets
+
+    async def test_publish_event(self, manager):
+        """Test publishing events."""
+        # Publish to core socket
+        await manager.publish_event("core", "test.event", {"key": "value"})
+
+        # Publish to non-existent socket (should log warning)
+        await manager.publish_event("non-existent", "test.event", {})
+
+    async def test_get_stats(self, manager):
+        """Test getting event bus statistics."""
+        await manager.create_event_socket("infection-123")
+
+        stats = manager.get_stats()
+        assert stats["totalSources"] == 2  # core + infection-123
+        assert "core" in stats["sources"]
+        assert "infection-123" in stats["sources"]
+        assert stats["rateLimit"] == 50
+        assert stats["burstSize"] == 100
+
+    async def test_reset_keeps_only_core(self, manager):
+        """Test reset removes source sockets."""
+        socket = await manager.create_event_socket("infection-456")
+
+        await manager.reset()
+        assert list(manager.sockets) == ["core"]
+        assert not os.path.exists(socket.socket_path)
 
 
 @pytest.mark.skipif(sys.version_info > (3, 12), reason="Broken in 3.12 and it hangs")
 class TestEventBusIntegration:
     """Integration tests for event bus system."""
 
-    @pytest.fixture
-    def temp_events_dir(self):
-        """Create temporary events directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
-
     @pytest.mark.asyncio
-    async def test_end_to_end_event_flow(self, temp_events_dir):
+    async def test_end_to_end_event_flow(self, temp_events_dir, wait_for_subscribers):
         """Test complete event publishing and subscription flow."""
         manager = EventBusManager(temp_events_dir)
         await manager.start()
@@ -238,19 +396,15 @@ class TestEventBusIntegration:
 
             try:
                 # Publish event
-                await asyncio.sleep(1.0)
+                await wait_for_subscribers(manager.sockets["core"], 1)
                 await manager.publish_event("core", "test.event", {"message": "hello"})
 
                 # Read event (with timeout)
                 try:
-                    length_data = await asyncio.wait_for(reader.readexactly(4), timeout=1.0)
-                    event_length = int.from_bytes(length_data, "big")
                     event_data = await asyncio.wait_for(
-                        reader.readexactly(event_length), timeout=1.0
+                        UDSProtocol.receive_frame(reader), timeout=1.0
                     )
-
-                    event_json = event_data.decode("utf-8")
-                    event_dict = json.loads(event_json)
+                    event_dict = json.loads(event_data)
 
                     assert event_dict["source"] == "core"
                     assert event_dict["type"] == "test.event"
@@ -267,7 +421,7 @@ class TestEventBusIntegration:
             await manager.stop()
 
     @pytest.mark.asyncio
-    async def test_multiple_subscribers(self, temp_events_dir):
+    async def test_multiple_subscribers(self, temp_events_dir, wait_for_subscribers):
         """Test event delivery to multiple subscribers."""
         manager = EventBusManager(temp_events_dir)
         await manager.start()
@@ -275,27 +429,23 @@ class TestEventBusIntegration:
         try:
             socket_path = manager.get_socket_path("core")
 
-            # Connect multiple subscribers
-            subscribers = []
-            for i in range(3):
-                reader, writer = await asyncio.open_unix_connection(socket_path)
-                subscribers.append((reader, writer))
+            # Connect multiple subscribers concurrently
+            subscribers = await asyncio.gather(
+                *(asyncio.open_unix_connection(socket_path) for _ in range(3))
+            )
 
             try:
                 # Publish event
-                await asyncio.sleep(1.0)
+                await wait_for_subscribers(manager.sockets["core"], 3)
                 await manager.publish_event("core", "broadcast.test", {"id": 42})
 
                 # All subscribers should receive the event
                 for i, (reader, writer) in enumerate(subscribers):
                     try:
-                        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=1.0)
-                        event_length = int.from_bytes(length_data, "big")
                         event_data = await asyncio.wait_for(
-                            reader.readexactly(event_length), timeout=1.0
+                            UDSProtocol.receive_frame(reader), timeout=1.0
                         )
-
-                        event_dict = json.loads(event_data.decode("utf-8"))
+                        event_dict = json.loads(event_data)
                         assert event_dict["type"] == "broadcast.test"
                         assert event_dict["payload"]["id"] == 42
 
@@ -303,9 +453,9 @@ class TestEventBusIntegration:
                         pytest.fail(f"Subscriber {i} did not receive event")
 
             finally:
-                for reader, writer in subscribers:
+                for _, writer in subscribers:
                     writer.close()
-                    await writer.wait_closed()
+                await asyncio.gather(*(writer.wait_closed() for _, writer in subscribers))
 
         finally:
             await manager.stop()
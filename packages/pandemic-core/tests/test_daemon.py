@@ -1,12 +1,10 @@
 """Tests for refactored daemon functionality."""
 
 import asyncio
-from unittest.mock import AsyncMock
 
 import pytest
-from pandemic_common.protocol import UDSProtocol
-
-# Import will be done in fixture to avoid import issues
+from pandemic_common.protocol import UDSClient
+from pandemic_core.daemon import PandemicDaemon
 
 
 class TestPandemicDaemon:
@@ -16,7 +14,7 @@ class TestPandemicDaemon:
     async def test_daemon_start_stop(self, daemon, test_config):
         """Test daemon start and stop."""
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         assert daemon.running is True
 
@@ -62,24 +60,41 @@ class TestPandemicDaemon:
         assert response["runningCount"] == 1
         assert len(response["infections"]) == 2
 
+        response = await daemon.handle_list({"filter": {"state": "stopped"}})
+        assert [i["infectionId"] for i in response["infections"]] == ["test-2"]
+        assert response["runningCount"] == 0
+
     @pytest.mark.asyncio
-    async def test_install_infection(self, daemon):
-        """Test infection installation."""
-        # Mock source manager
-        daemon.source_manager.install_from_source = AsyncMock(
-            return_value={
-                "installationPath": "/opt/pandemic/infections/test-infection",
-                "downloadInfo": {"source": "github://test/repo@v1.0.0", "type": "github"},
-                "configInfo": {"metadata": {"name": "test-infection"}},
-            }
+    async def test_status_refreshes_running_count(self, daemon):
+        """Test a status lookup records the systemd state for later listings."""
+        daemon.state_manager.add_infection(
+            "test-1", {"infectionId": "test-1", "state": "installed", "serviceName": "test.service"}
         )
 
+        daemon.state_manager.flush()
+
+        response = await daemon.handle_status({"infectionId": "test-1"})
+        assert response["state"] == "running"
+        assert "systemdStatus" in response
+
+        # Status is read-only: nothing transient is stored and nothing is written
+        assert "systemdStatus" not in daemon.state_manager.get_infection("test-1")
+        assert not daemon.state_manager._dirty
+
+        response = await daemon.handle_list({})
+        assert response["runningCount"] == 1
+
+    @pytest.mark.asyncio
+    async def test_install_infection(self, daemon, fake_source_manager):
+        """Test infection installation."""
+        daemon.source_manager = fake_source_manager
+
         payload = {"source": "github://test/repo@v1.0.0", "name": "test-infection"}
         response = await daemon.handle_install(payload)
 
         assert "infectionId" in response
         assert response["serviceName"] == "test.service"
-        daemon.source_manager.install_from_source.assert_called_once()
+        assert fake_source_manager.calls == [("github://test/repo@v1.0.0", "test-infection")]
 
     @pytest.mark.asyncio
     async def test_install_without_source(self, daemon):
@@ -97,29 +112,24 @@ class TestPandemicDaemon:
         response = await daemon.handle_start({"infectionId": "test-123"})
 
         assert response["status"] == "started"
-        daemon.systemd_manager.start_service.assert_called_once_with("test.service")
+        assert daemon.systemd_manager.calls == [("start_service", ("test.service",))]
 
     @pytest.mark.asyncio
     async def test_client_communication(self, daemon, test_config):
         """Test full client communication via socket."""
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
-            reader, writer = await asyncio.open_unix_connection(test_config.socket_path)
-
-            # Send health check using UDS protocol
-            request = UDSProtocol.create_request("health")
-            await UDSProtocol.send_message(writer, request)
+            async with UDSClient(test_config.socket_path) as client:
+                response = await client.request("health")
 
-            # Read response
-            response = await UDSProtocol.receive_message(reader)
+                assert response["status"] == "success"
+                assert response["payload"]["status"] == "healthy"
 
-            assert response["status"] == "success"
-            assert response["payload"]["status"] == "healthy"
-
-            writer.close()
-            await writer.wait_closed()
+                # The same connection serves the next request
+                response = await client.request("list")
+                assert response["status"] == "success"
 
         finally:
             await daemon.stop()
@@ -129,34 +139,35 @@ class TestPandemicDaemon:
     async def test_unknown_command(self, daemon, test_config):
         """Test unknown command returns error."""
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
-            reader, writer = await asyncio.open_unix_connection(test_config.socket_path)
-
-            request = UDSProtocol.create_request("unknown")
-            await UDSProtocol.send_message(writer, request)
-
-            response = await UDSProtocol.receive_message(reader)
+            async with UDSClient(test_config.socket_path) as client:
+                response = await client.request("unknown")
 
             assert response["status"] == "error"
             assert "Unknown command" in response["error"]
 
-            writer.close()
-            await writer.wait_closed()
-
         finally:
             await daemon.stop()
             start_task.cancel()
 
-    def test_extract_name_from_source(self, daemon):
-        """Test extracting name from source URL."""
-        assert daemon._extract_name_from_source("github://user/my-repo@v1.0.0") == "my-repo"
-        assert daemon._extract_name_from_source("unknown://source") == "unknown"
 
-    def test_map_systemd_state(self, daemon):
+class TestPandemicDaemonHelpers:
+    """Test daemon helpers that need no daemon instance."""
+
+    def test_extract_name_from_source(self):
+        """Test extracting name from source URL."""
+        assert PandemicDaemon._extract_name_from_source("github://user/my-repo@v1.0.0") == "my-repo"
+        assert PandemicDaemon._extract_name_from_source("github://user/my-repo") == "my-repo"
+        assert PandemicDaemon._extract_name_from_source("github://user/my-repo/sub@v1") == "my-repo"
+        assert PandemicDaemon._extract_name_from_source("github:///my-repo") == "unknown"
+        assert PandemicDaemon._extract_name_from_source("github://user/@v1") == "unknown"
+        assert PandemicDaemon._extract_name_from_source("unknown://source") == "unknown"
+
+    def test_map_systemd_state(self):
         """Test mapping systemd states to infection states."""
-        assert daemon._map_systemd_state("active") == "running"
-        assert daemon._map_systemd_state("inactive") == "stopped"
-        assert daemon._map_systemd_state("failed") == "failed"
-        assert daemon._map_systemd_state("unknown") == "unknown"
+        assert PandemicDaemon._map_systemd_state("active") == "running"
+        assert PandemicDaemon._map_systemd_state("inactive") == "stopped"
+        assert PandemicDaemon._map_systemd_state("failed") == "failed"
+        assert PandemicDaemon._map_systemd_state("unknown") == "unknown"
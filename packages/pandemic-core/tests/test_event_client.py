@@ -0,0 +1,114 @@
+"""Tests for the event bus client."""
+
+import asyncio
+import gc
+from typing import Any, Dict
+
+import pytest
+from pandemic_common import UnixDaemonServer, route
+from pandemic_common.protocol import UDSProtocol
+from pandemic_core.event_client import EventClient
+
+
+class FakeEventBus(UnixDaemonServer):
+    """Minimal event bus daemon for client tests."""
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path)
+        self.connections = 0
+
+    async def _handle_client(self, reader, writer):
+        self.connections += 1
+        await super()._handle_client(reader, writer)
+
+    @route("publish")
+    async def handle_publish(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Echo the published event type."""
+        if payload["eventType"] == "bad.event":
+            raise ValueError("rejected")
+        return {"published": True, "eventType": payload["eventType"]}
+
+
+@pytest.fixture
+async def event_bus(temp_dir):
+    """Running fake event bus daemon."""
+    daemon = FakeEventBus(str(temp_dir / "event-bus.sock"))
+    server_task = asyncio.create_task(daemon.start())
+    await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
+
+    yield daemon
+
+    await daemon.stop()
+    server_task.cancel()
+    try:
+        await server_task
+    except asyncio.CancelledError:
+        pass
+
+
+class TestEventClient:
+    """Test EventClient class."""
+
+    @pytest.mark.asyncio
+    async def test_pipelined_publishes_share_connection(self, event_bus):
+        """Test concurrent publishes are matched to their own responses."""
+        client = EventClient(event_bus.socket_path)
+
+        try:
+            results = await asyncio.gather(
+                *(client.publish("core", f"test.event{i}", {"id": i}) for i in range(20))
+            )
+            await client.flush()
+
+            assert [r["eventType"] for r in results] == [f"test.event{i}" for i in range(20)]
+            assert event_bus.connections == 1
+        finally:
+            await client.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_error_response_keeps_connection(self, event_bus):
+        """Test an error response does not drop the connection."""
+        client = EventClient(event_bus.socket_path)
+
+        try:
+            with pytest.raises(RuntimeError, match="rejected"):
+                await client.publish("core", "bad.event", {})
+
+            result = await client.publish("core", "good.event", {})
+            assert result["published"] is True
+            assert event_bus.connections == 1
+        finally:
+            await client.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_send_failure_drops_pending_request(self, event_bus, monkeypatch):
+        """Test a failed send leaves no orphaned future behind."""
+        client = EventClient(event_bus.socket_path)
+        await client.connect()
+
+        async def broken_send(writer, message):
+            raise BrokenPipeError("gone")
+
+        monkeypatch.setattr(UDSProtocol, "send_message", broken_send)
+        loop = asyncio.get_running_loop()
+        errors = []
+        previous = loop.get_exception_handler()
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+        try:
+            with pytest.raises(BrokenPipeError):
+                await client.publish("core", "test.event", {})
+
+            assert client._pending == {}
+            gc.collect()
+            assert errors == []
+        finally:
+            loop.set_exception_handler(previous)
+            await client.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_connect_unavailable(self, temp_dir):
+        """Test publishing without a running event bus."""
+        client = EventClient(str(temp_dir / "missing.sock"))
+
+        with pytest.raises(ConnectionError):
+            await client.publish("core", "test.event", {})
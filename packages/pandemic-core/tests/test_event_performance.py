@@ -1,24 +1,63 @@
 """Performance tests for event bus system."""
 
 import asyncio
+import json
 import sys
-import tempfile
 import time
 from statistics import mean, stdev
 
 import pytest
+from pandemic_common.protocol import LENGTH_PREFIX, UDSProtocol
 from pandemic_core.events import EventBusManager
 
 
+class _FrameDecoder(asyncio.BufferedProtocol):
+    """Subscriber that decodes length-prefixed frames straight into a reused buffer."""
+
+    def __init__(self, size: int = 65536):
+        self._new_buffer(size)
+        self.pos = 0
+        self.frames: asyncio.Queue = asyncio.Queue()
+        self.transport = None
+
+    def _new_buffer(self, size: int):
+        self.buffer = bytearray(size)
+        self.buffer_view = memoryview(self.buffer)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self.pos == len(self.buffer):
+            # A single frame outgrew the buffer; keep what we have and double it
+            old = self.buffer_view
+            self._new_buffer(len(old) * 2)
+            self.buffer_view[: self.pos] = old
+        return self.buffer_view[self.pos :]
+
+    def buffer_updated(self, nbytes: int):
+        self.pos += nbytes
+        start = 0
+        while self.pos - start >= LENGTH_PREFIX.size:
+            (length,) = LENGTH_PREFIX.unpack_from(self.buffer, start)
+            end = start + LENGTH_PREFIX.size + length
+            if end > self.pos:
+                break
+            self.frames.put_nowait(bytes(self.buffer_view[start + LENGTH_PREFIX.size : end]))
+            start = end
+
+        if start:
+            # Shift any partial frame to the front of the buffer
+            self.buffer_view[: self.pos - start] = self.buffer_view[start : self.pos]
+            self.pos -= start
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+
 class TestEventBusPerformance:
     """Performance benchmarks for event bus."""
 
-    @pytest.fixture
-    def temp_events_dir(self):
-        """Create temporary events directory."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield temp_dir
-
     @pytest.mark.asyncio
     async def test_event_publishing_throughput(self, temp_events_dir):
         """Test event publishing throughput."""
@@ -52,7 +91,7 @@ class TestEventBusPerformance:
 
     @pytest.mark.skipif(sys.version_info > (3, 12), reason="Broken in 3.12 and it hangs")
     @pytest.mark.asyncio
-    async def test_event_delivery_latency(self, temp_events_dir):
+    async def test_event_delivery_latency(self, temp_events_dir, wait_for_subscribers):
         """Test event delivery latency."""
         manager = EventBusManager(temp_events_dir)
         await manager.start()
@@ -61,32 +100,31 @@ class TestEventBusPerformance:
             socket_path = manager.get_socket_path("core")
 
             # Connect subscriber
-            reader, writer = await asyncio.open_unix_connection(socket_path)
+            loop = asyncio.get_running_loop()
+            transport, decoder = await loop.create_unix_connection(_FrameDecoder, socket_path)
 
             try:
                 latencies = []
                 num_tests = 50
 
-                await asyncio.sleep(1.0)
+                await wait_for_subscribers(manager.sockets["core"], 1)
                 for i in range(num_tests):
-                    # Record publish time
-                    publish_time = time.time()
+                    # Record publish time on the monotonic clock, in integer ns
+                    publish_ns = time.monotonic_ns()
 
                     # Publish event
                     await manager.publish_event(
-                        "core", "latency.test", {"id": i, "timestamp": publish_time}
+                        "core", "latency.test", {"id": i, "timestamp": publish_ns}
                     )
 
                     # Receive event
-                    length_data = await asyncio.wait_for(reader.readexactly(4), timeout=1.0)
-                    event_length = int.from_bytes(length_data, "big")
-                    event_data = await reader.readexactly(event_length)
+                    event_data = await asyncio.wait_for(decoder.frames.get(), timeout=1.0)
 
-                    # Record receive time
-                    receive_time = time.time()
-                    latency = (receive_time - publish_time) * 1000  # Convert to ms
-                    latencies.append(latency)
+                    latencies.append(time.monotonic_ns() - publish_ns)
+                    assert json.loads(event_data)["payload"]["id"] == i
 
+                # Convert to ms once, for reporting
+                latencies = [latency / 1e6 for latency in latencies]
                 avg_latency = mean(latencies)
                 max_latency = max(latencies)
                 min_latency = min(latencies)
@@ -103,15 +141,14 @@ class TestEventBusPerformance:
                 assert avg_latency < 10.0
 
             finally:
-                writer.close()
-                await writer.wait_closed()
+                transport.close()
 
         finally:
             await manager.stop()
 
     @pytest.mark.skipif(sys.version_info > (3, 12), reason="Broken in 3.12 and it hangs")
     @pytest.mark.asyncio
-    async def test_multiple_subscribers_performance(self, temp_events_dir):
+    async def test_multiple_subscribers_performance(self, temp_events_dir, wait_for_subscribers):
         """Test performance with multiple subscribers."""
         manager = EventBusManager(temp_events_dir)
         await manager.start()
@@ -120,29 +157,25 @@ class TestEventBusPerformance:
             socket_path = manager.get_socket_path("core")
             num_subscribers = 10
 
-            # Connect multiple subscribers
-            subscribers = []
-            for i in range(num_subscribers):
-                reader, writer = await asyncio.open_unix_connection(socket_path)
-                subscribers.append((reader, writer))
+            # Connect multiple subscribers concurrently
+            subscribers = await asyncio.gather(
+                *(asyncio.open_unix_connection(socket_path) for _ in range(num_subscribers))
+            )
 
             try:
-                await asyncio.sleep(2.0)
+                await wait_for_subscribers(manager.sockets["core"], num_subscribers)
                 # Publish events and measure time
                 num_events = 50
                 start_time = time.time()
 
-                for i in range(num_events):
-                    await manager.publish_event("core", "multi.test", {"id": i})
+                await manager.publish_events(
+                    "core", [("multi.test", {"id": i}) for i in range(num_events)]
+                )
 
                 # Verify all subscribers receive all events
                 for sub_id, (reader, writer) in enumerate(subscribers):
                     for event_id in range(num_events):
-                        length_data = await asyncio.wait_for(reader.readexactly(4), timeout=1.0)
-                        event_length = int.from_bytes(length_data, "big")
-                        event_data = await asyncio.wait_for(
-                            reader.readexactly(event_length), timeout=1.0
-                        )
+                        await asyncio.wait_for(UDSProtocol.receive_frame(reader), timeout=1.0)
 
                 end_time = time.time()
                 duration = end_time - start_time
@@ -159,9 +192,9 @@ class TestEventBusPerformance:
                 assert delivery_rate > 1000
 
             finally:
-                for reader, writer in subscribers:
+                for _, writer in subscribers:
                     writer.close()
-                    await writer.wait_closed()
+                await asyncio.gather(*(writer.wait_closed() for _, writer in subscribers))
 
         finally:
             await manager.stop()
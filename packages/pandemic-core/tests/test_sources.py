@@ -1,12 +1,19 @@
 """Tests for source management."""
 
+import asyncio
+import io
+import os
+import shutil
+import tarfile
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import web
 from pandemic_core.sources import (
     GitHubSourceHandler,
+    HttpClient,
     HttpSourceHandler,
     LocalSourceHandler,
     SourceManager,
@@ -22,6 +29,8 @@ class TestGitHubSourceHandler:
 
         assert handler.validate_source("github://user/repo")
         assert handler.validate_source("github://user/repo@v1.0.0")
+        assert not handler.validate_source("github://user")
+        assert not handler.validate_source("github://user/@v1.0.0")
         assert not handler.validate_source("https://github.com/user/repo")
         assert not handler.validate_source("file:///path/to/file")
 
@@ -30,10 +39,7 @@ class TestGitHubSourceHandler:
         """Test GitHub download."""
         handler = GitHubSourceHandler(test_config)
 
-        with (
-            patch.object(handler, "_download_file", new_callable=AsyncMock),
-            patch.object(handler, "_extract_archive", new_callable=AsyncMock),
-        ):
+        with patch.object(handler, "_download_and_extract", new_callable=AsyncMock):
             result = await handler.download("github://user/repo@v1.0.0", temp_dir)
 
             assert result["source"] == "github://user/repo@v1.0.0"
@@ -41,6 +47,12 @@ class TestGitHubSourceHandler:
             assert result["repository"] == "user/repo"
             assert result["ref"] == "v1.0.0"
 
+            result = await handler.download("github://user/repo", temp_dir)
+            assert result["ref"] == "main"
+
+            with pytest.raises(ValueError, match="Invalid GitHub source"):
+                await handler.download("github://user", temp_dir)
+
 
 class TestHttpSourceHandler:
     """Test HTTP source handler."""
@@ -59,10 +71,7 @@ class TestHttpSourceHandler:
         """Test HTTP archive download."""
         handler = HttpSourceHandler(test_config)
 
-        with (
-            patch.object(handler, "_download_file", new_callable=AsyncMock),
-            patch.object(handler, "_extract_archive", new_callable=AsyncMock),
-        ):
+        with patch.object(handler, "_download_and_extract", new_callable=AsyncMock):
             result = await handler.download("https://example.com/infection.tar.gz", temp_dir)
 
             assert result["source"] == "https://example.com/infection.tar.gz"
@@ -81,6 +90,75 @@ class TestHttpSourceHandler:
             assert result["type"] == "http"
             assert result["filename"] == "script.py"
 
+    @pytest.mark.asyncio
+    async def test_download_file_streams_over_shared_session(self, test_config, temp_dir):
+        """Test files are streamed to disk and errors surface as RuntimeError."""
+        body = b"#!/bin/sh\n" * 20000
+
+        async def serve_script(request):
+            return web.Response(body=body)
+
+        app = web.Application()
+        app.router.add_get("/script.sh", serve_script)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        http_client = HttpClient()
+        handler = HttpSourceHandler(test_config, http_client)
+        try:
+            await handler.download(f"http://127.0.0.1:{port}/script.sh", temp_dir)
+            assert (temp_dir / "script.sh").read_bytes() == body
+
+            with pytest.raises(RuntimeError, match="Download failed"):
+                await handler.download(f"http://127.0.0.1:{port}/missing.sh", temp_dir)
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_download_archive_streams_extraction(self, test_config, temp_dir):
+        """Test archives are extracted from the response stream with the top folder stripped."""
+        files = [
+            ("repo-1.0/infection.yaml", b"metadata: {}\n"),
+            ("repo-1.0/bin/run", b"x" * 100000),
+        ]
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for name, data in files:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        async def serve_archive(request):
+            if request.path.endswith("bad.tar.gz"):
+                return web.Response(body=b"not a tarball")
+            return web.Response(body=buffer.getvalue())
+
+        app = web.Application()
+        app.router.add_get("/{name}", serve_archive)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        http_client = HttpClient()
+        handler = HttpSourceHandler(test_config, http_client)
+        try:
+            target_dir = temp_dir / "target"
+            await handler.download(f"http://127.0.0.1:{port}/infection.tar.gz", target_dir)
+            assert (target_dir / "infection.yaml").read_bytes() == b"metadata: {}\n"
+            assert (target_dir / "bin" / "run").read_bytes() == b"x" * 100000
+
+            with pytest.raises(RuntimeError, match="Extraction failed"):
+                await handler.download(f"http://127.0.0.1:{port}/bad.tar.gz", temp_dir / "bad")
+        finally:
+            await http_client.close()
+            await runner.cleanup()
+
 
 class TestLocalSourceHandler:
     """Test local source handler."""
@@ -131,6 +209,71 @@ class TestLocalSourceHandler:
         assert (target_dir / "file1.txt").exists()
         assert (target_dir / "file2.txt").exists()
 
+    @pytest.mark.asyncio
+    async def test_download_archive_extracts(self, test_config, temp_dir):
+        """Test local tar.gz sources are extracted with the top folder stripped."""
+        handler = LocalSourceHandler(test_config)
+
+        archive_path = temp_dir / "infection.tar.gz"
+        with tarfile.open(archive_path, mode="w:gz") as archive:
+            info = tarfile.TarInfo("infection-1.0/infection.yaml")
+            info.size = 13
+            archive.addfile(info, io.BytesIO(b"metadata: {}\n"))
+
+        target_dir = temp_dir / "target"
+        await handler.download(str(archive_path), target_dir)
+
+        assert (target_dir / "infection.yaml").read_bytes() == b"metadata: {}\n"
+
+    @pytest.mark.asyncio
+    async def test_download_nested_directory_preserves_content_and_mode(
+        self, test_config, temp_dir
+    ):
+        """Test nested directories are copied with file contents and modes intact."""
+        handler = LocalSourceHandler(test_config)
+
+        source_dir = temp_dir / "source"
+        (source_dir / "bin").mkdir(parents=True)
+        binary = source_dir / "bin" / "infection"
+        binary.write_bytes(b"#!/bin/sh\necho hi\n" * 1000)
+        binary.chmod(0o755)
+
+        target_dir = temp_dir / "target"
+        await handler.download(str(source_dir), target_dir)
+
+        copied = target_dir / "bin" / "infection"
+        assert copied.read_bytes() == binary.read_bytes()
+        assert copied.stat().st_mode & 0o777 == 0o755
+
+    @pytest.mark.asyncio
+    async def test_download_file_falls_back_to_sendfile(self, test_config, temp_dir):
+        """Test files are still copied in the kernel without copy_file_range."""
+        handler = LocalSourceHandler(test_config)
+        source = temp_dir / "payload.bin"
+        source.write_bytes(bytes(range(256)) * 4096)
+
+        with (
+            patch("pandemic_core.sources.fcntl.ioctl", side_effect=OSError),
+            patch("pandemic_core.sources._copy_file_range", side_effect=OSError),
+            patch("pandemic_core.sources.shutil.copy2") as copy2,
+        ):
+            await handler.download(str(source), temp_dir / "target")
+
+        copy2.assert_not_called()
+        assert (temp_dir / "target" / "payload.bin").read_bytes() == source.read_bytes()
+
+    @pytest.mark.asyncio
+    async def test_download_rejects_fifo(self, test_config, temp_dir):
+        """Test a FIFO in the source tree fails the copy instead of blocking it."""
+        handler = LocalSourceHandler(test_config)
+        source = temp_dir / "source"
+        source.mkdir()
+        (source / "infection.yaml").write_text("metadata: {}\n")
+        os.mkfifo(source / "pipe")
+
+        with pytest.raises(shutil.SpecialFileError):
+            await asyncio.wait_for(handler.download(str(source), temp_dir / "target"), 2.0)
+
 
 class TestSourceManager:
     """Test source manager."""
@@ -151,6 +294,9 @@ class TestSourceManager:
         unknown_handler = manager._get_handler("unknown://source")
         assert unknown_handler is None
 
+        # A matching prefix still has to pass the handler's validation
+        assert manager._get_handler("github://bad") is None
+
     @pytest.mark.asyncio
     async def test_install_from_source(self, test_config, temp_dir):
         """Test complete installation from source."""
@@ -159,6 +305,7 @@ class TestSourceManager:
 
         # Mock handler
         mock_handler = MagicMock()
+        mock_handler.prefixes = ("test://",)
         mock_handler.validate_source.return_value = True
         mock_handler.download = AsyncMock(
             return_value={
@@ -181,6 +328,36 @@ class TestSourceManager:
             assert "configInfo" in result
             mock_handler.download.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_install_replaces_existing_in_background(self, test_config, temp_dir):
+        """Test reinstall moves the old tree aside and leftovers are swept."""
+        test_config.infections_dir = str(temp_dir)
+        manager = SourceManager(test_config)
+
+        existing = temp_dir / "test-infection"
+        existing.mkdir()
+        (existing / "old.txt").write_text("old")
+        stale = temp_dir / ".trash" / "other-deadbeef"
+        stale.mkdir(parents=True)
+        # Infection names may contain dots; only the trash directory is swept
+        dotted = temp_dir / "repo.trash-deadbeef"
+        dotted.mkdir()
+
+        mock_handler = MagicMock()
+        mock_handler.prefixes = ("test://",)
+        mock_handler.validate_source.return_value = True
+        mock_handler.download = AsyncMock(return_value={"source": "test://source"})
+        manager.handlers = [mock_handler]
+
+        manager.sweep_trash()
+        with patch.object(manager, "_load_infection_config", new_callable=AsyncMock):
+            await manager.install_from_source("test://source", "test-infection")
+        await manager.close()
+
+        assert not existing.exists()
+        assert dotted.exists()
+        assert list((temp_dir / ".trash").iterdir()) == []
+
     def test_validate_source_security_allowed(self, test_config):
         """Test source security validation with allowed sources."""
         test_config.allowed_sources = ["github://trusted/", "https://trusted.com/"]
@@ -1,6 +1,10 @@
 """Tests for state management."""
 
+import asyncio
 import json
+import threading
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from pandemic_core.state import StateManager
@@ -74,16 +78,159 @@ class TestStateManager:
         assert state_manager.get_running_count() == 2
         assert state_manager.get_infection_count() == 3
 
-    def test_state_persistence(self, test_config, temp_dir):
+        state_manager.update_infection_state("test-2", "running")
+        state_manager.add_infection("test-1", {"infectionId": "test-1", "state": "stopped"})
+        state_manager.remove_infection("test-3")
+        assert state_manager.get_running_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_state_persistence(self, test_config, temp_dir):
         """Test state persistence across manager instances."""
-        # Create first manager and add infection
+        # Create first manager and add infection; the save is debounced
         manager1 = StateManager(test_config)
         infection_data = {"infectionId": "test-123", "name": "persistent"}
         manager1.add_infection("test-123", infection_data)
+        manager1.update_infection_state("test-123", "running")
+        assert not (temp_dir / "manifest.json").exists()
+
+        manager1.close()
 
         # Create second manager (should load existing state)
         manager2 = StateManager(test_config)
         retrieved = manager2.get_infection("test-123")
 
-        assert retrieved == infection_data
+        assert retrieved == {**infection_data, "state": "running"}
         assert manager2.get_infection_count() == 1
+        assert manager2.get_running_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_is_saved_once(self, test_config):
+        """Test a burst of mutations is coalesced into a single write."""
+        manager = StateManager(test_config)
+
+        with patch.object(manager, "_save_state", wraps=manager._save_state) as save:
+            for i in range(10):
+                manager.add_infection(f"test-{i}", {"infectionId": f"test-{i}"})
+            manager.update_infection_state("test-0", "running")
+            assert save.call_count == 0
+
+            manager.flush()
+            assert save.call_count == 1
+
+        reloaded = StateManager(test_config)
+        assert reloaded.get_infection_count() == 10
+        assert reloaded.get_infection("test-0")["state"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_debounced_save_runs_off_the_event_loop(self, test_config):
+        """Test scheduled saves are written by the writer thread, not the loop thread."""
+        manager = StateManager(test_config, save_delay=0.01)
+        threads = []
+        save_state = manager._save_state
+
+        def record_thread(*args):
+            threads.append(threading.current_thread().name)
+            return save_state(*args)
+
+        with patch.object(manager, "_save_state", side_effect=record_thread):
+            manager.add_infection("test-1", {"infectionId": "test-1"})
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                if threads:
+                    break
+            manager.close()
+
+        assert len(threads) == 1
+        assert threads[0].startswith("pandemic-state")
+        assert StateManager(test_config).get_infection("test-1") == {"infectionId": "test-1"}
+
+    @pytest.mark.asyncio
+    async def test_failed_background_save_is_retried(self, test_config):
+        """Test a failed background save is retried without another mutation."""
+        manager = StateManager(test_config, save_delay=0.01)
+        write_atomic = manager._write_atomic
+        attempts = []
+
+        def fail_first(path, data):
+            attempts.append(path.name)
+            return len(attempts) > 1 and write_atomic(path, data)
+
+        with patch.object(manager, "_write_atomic", side_effect=fail_first):
+            manager.add_infection("test-1", {"infectionId": "test-1"})
+            shard = manager.infections_dir / "test-1.json"
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if manager.manifest_file.exists():
+                    break
+
+        assert shard.exists()
+        assert manager.manifest_file.exists()
+        assert attempts[0] == "test-1.json"
+        manager.close()
+
+    def test_invalid_infection_id_is_rejected(self, state_manager):
+        """Test ids that cannot name a shard are refused and never block a save."""
+        with pytest.raises(ValueError, match="Invalid infection id"):
+            state_manager.add_infection("../escape", {"infectionId": "../escape"})
+        assert state_manager.get_infection_count() == 0
+
+        failed, manifest_failed = state_manager._save_state(
+            {"../escape": b"{}", "test-1": b'{"infectionId":"test-1"}'}, b'["test-1"]'
+        )
+
+        assert (failed, manifest_failed) == (set(), False)
+        assert (state_manager.infections_dir / "test-1.json").exists()
+        assert json.loads(state_manager.manifest_file.read_text()) == ["test-1"]
+
+    def test_corrupted_write_keeps_previous_state(self, test_config):
+        """Test a write whose read-back hash mismatches never replaces the state files."""
+        manager = StateManager(test_config)
+        manager.add_infection("test-1", {"infectionId": "test-1"})
+        shard = manager.infections_dir / "test-1.json"
+        saved_shard = shard.read_bytes()
+        saved_manifest = manager.manifest_file.read_bytes()
+
+        with patch.object(Path, "read_bytes", return_value=b"garbage"):
+            manager.update_infection_state("test-1", "running")
+            manager.add_infection("test-2", {"infectionId": "test-2"})
+
+        assert shard.read_bytes() == saved_shard
+        assert manager.manifest_file.read_bytes() == saved_manifest
+        assert not shard.with_suffix(".tmp").exists()
+        assert not (manager.infections_dir / "test-2.json").exists()
+
+    def test_mutation_rewrites_only_its_shard(self, state_manager):
+        """Test each infection is stored in its own file listed by the manifest."""
+        state_manager.add_infection("test-1", {"infectionId": "test-1"})
+        state_manager.add_infection("test-2", {"infectionId": "test-2"})
+        other_mtime = (state_manager.infections_dir / "test-2.json").stat().st_mtime_ns
+
+        with patch.object(state_manager, "_write_atomic", wraps=state_manager._write_atomic) as w:
+            state_manager.update_infection_state("test-1", "running")
+            assert [call.args[0].name for call in w.call_args_list] == ["test-1.json"]
+
+        assert (state_manager.infections_dir / "test-2.json").stat().st_mtime_ns == other_mtime
+        assert json.loads(state_manager.manifest_file.read_text()) == ["test-1", "test-2"]
+
+        state_manager.remove_infection("test-1")
+        assert not (state_manager.infections_dir / "test-1.json").exists()
+        assert json.loads(state_manager.manifest_file.read_text()) == ["test-2"]
+
+    def test_legacy_state_is_migrated(self, test_config, temp_dir):
+        """Test a single state.json is split into shards and removed."""
+        state_file = Path(test_config.state_dir) / "state.json"
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        infections = {
+            "test-2": {"infectionId": "test-2", "state": "running"},
+            "test-1": {"infectionId": "test-1", "state": "stopped"},
+        }
+        state_file.write_text(json.dumps({"infections": infections}))
+
+        manager = StateManager(test_config)
+
+        assert not state_file.exists()
+        assert manager.list_infections() == list(infections.values())
+        assert manager.get_running_count() == 1
+
+        reloaded = StateManager(test_config)
+        assert reloaded.list_infections() == list(infections.values())
@@ -1,9 +1,68 @@
 """Tests for systemd integration."""
 
+import asyncio
+from typing import Any, Dict
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pandemic_common import UnixDaemonServer, route
+from pandemic_common.protocol import UDSProtocol
 from pandemic_core.systemd import SystemdManager
+from pandemic_core.systemd_client import SystemdHelperClient
+
+
+class FakeHelper(UnixDaemonServer):
+    """Minimal systemd helper daemon counting client connections."""
+
+    def __init__(self, socket_path: str):
+        super().__init__(socket_path)
+        self.connections = 0
+        self.writers = []
+        self.batches = []
+
+    async def _handle_client(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+        await super()._handle_client(reader, writer)
+
+    @route("startService")
+    async def start_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Pretend to start a service."""
+        return {"status": "success", "operation": "started"}
+
+    @route("restartService")
+    async def restart_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Pretend to restart a service."""
+        if payload["serviceName"] == "missing.service":
+            raise ValueError("unit not found")
+        return {"status": "success", "operation": "restarted"}
+
+    @route("getStatus")
+    async def get_status(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer slowly so callers can give up mid-request."""
+        await asyncio.sleep(0.1)
+        return {"activeState": "active"}
+
+    @route("batchServices")
+    async def batch_services(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the batch and fail units named missing.service."""
+        self.batches.append(payload)
+        failed = {n: "unit not found" for n in payload["serviceNames"] if n == "missing.service"}
+        return {"status": "success", "operation": payload["operation"], "failed": failed}
+
+
+@pytest.fixture
+async def helper(temp_dir):
+    """Running fake systemd helper daemon."""
+    daemon = FakeHelper(str(temp_dir / "helper.sock"))
+    server_task = asyncio.create_task(daemon.start())
+    await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
+
+    yield daemon
+
+    await daemon.stop()
+    server_task.cancel()
+    await asyncio.gather(server_task, return_exceptions=True)
 
 
 class TestSystemdManager:
@@ -61,12 +120,17 @@ class TestSystemdManager:
     @pytest.mark.asyncio
     async def test_get_service_status(self, systemd_manager):
         """Test getting service status."""
-        mock_response = {
-            "activeState": "active",
-            "subState": "running",
-            "pid": 12345,
-            "memoryUsage": "67108864",
-        }
+        mock_response = UDSProtocol.create_response(
+            "1",
+            payload={
+                "activeState": "active",
+                "subState": "running",
+                "pid": 12345,
+                "memoryUsage": "67108864",
+                "cpuUsageNSec": "30000000000",
+                "uptimeSeconds": 3750,
+            },
+        )
 
         with (
             patch.object(systemd_manager.helper_client, "connect", new_callable=AsyncMock),
@@ -84,11 +148,15 @@ class TestSystemdManager:
             assert status["subState"] == "running"
             assert status["pid"] == 12345
             assert status["memoryUsage"] == "64.0MB"
+            assert status["cpuUsage"] == "0.8%"
+            assert status["uptime"] == "1h 2m"
 
     @pytest.mark.asyncio
     async def test_get_service_logs(self, systemd_manager):
         """Test getting service logs."""
-        mock_response = {"logs": [{"message": "Test log", "level": "6", "timestamp": "123456"}]}
+        mock_response = UDSProtocol.create_response(
+            "1", payload={"logs": [{"message": "Test log", "level": "6", "timestamp": "123456"}]}
+        )
 
         with (
             patch.object(systemd_manager.helper_client, "connect", new_callable=AsyncMock),
@@ -112,6 +180,41 @@ class TestSystemdManager:
         assert systemd_manager._format_memory("1024") == "1.0KB"
         assert systemd_manager._format_memory("1048576") == "1.0MB"
         assert systemd_manager._format_memory("1073741824") == "1.0GB"
+        assert systemd_manager._format_memory("1536") == "1.5KB"
+        assert systemd_manager._format_memory("512") == "512.0B"
+        assert systemd_manager._format_memory(str(3 << 50)) == "3072.0TB"
+        assert systemd_manager._format_memory("[not set]") == "0B"
+
+    @pytest.mark.asyncio
+    async def test_status_is_cached_and_shared(self, systemd_manager):
+        """Test concurrent and repeated status lookups share one helper call."""
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def get_status(service_name):
+            started.set()
+            await release.wait()
+            return {"payload": {"activeState": "active", "subState": "running"}}
+
+        with (
+            patch.object(systemd_manager.helper_client, "get_status", side_effect=get_status) as m,
+            patch.object(systemd_manager.helper_client, "stop_service", new_callable=AsyncMock),
+        ):
+            pollers = [
+                asyncio.create_task(systemd_manager.get_service_status("test.service"))
+                for _ in range(5)
+            ]
+            await started.wait()
+            release.set()
+            results = await asyncio.gather(*pollers)
+
+            assert all(status["activeState"] == "active" for status in results)
+            await systemd_manager.get_service_status("test.service")
+            assert m.await_count == 1
+
+            await systemd_manager.stop_service("test.service")
+            await systemd_manager.get_service_status("test.service")
+            assert m.await_count == 2
 
     def test_map_syslog_level(self, systemd_manager):
         """Test syslog level mapping."""
@@ -120,6 +223,8 @@ class TestSystemdManager:
         assert systemd_manager._map_syslog_level("6") == "INFO"
         assert systemd_manager._map_syslog_level("7") == "DEBUG"
         assert systemd_manager._map_syslog_level("99") == "INFO"  # Unknown maps to INFO
+        assert systemd_manager._map_syslog_level("8") == "INFO"
+        assert systemd_manager._map_syslog_level("") == "INFO"
 
     def test_generate_override_config(self, systemd_manager):
         """Test generating systemd override configuration."""
@@ -136,3 +241,76 @@ class TestSystemdManager:
         assert f'Environment="PANDEMIC_SOCKET={systemd_manager.config.socket_path}"' in config
         assert "MemoryLimit=128M" in config
         assert "CPUQuota=50%" in config
+
+
+class TestSystemdHelperClient:
+    """Test helper client connection handling."""
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_one_connection(self, helper):
+        """Test consecutive requests share a connection and reconnect once it drops."""
+        client = SystemdHelperClient(helper.socket_path)
+
+        try:
+            for _ in range(3):
+                await client.start_service("test.service")
+            assert helper.connections == 1
+
+            # Helper side hangs up; the next request transparently reconnects
+            for writer in helper.writers:
+                writer.close()
+            await asyncio.sleep(0.05)
+
+            response = await client.start_service("test.service")
+            assert response["payload"]["operation"] == "started"
+            assert helper.connections == 2
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_desync(self, helper):
+        """Test a request cancelled after sending does not leak its reply to the next."""
+        client = SystemdHelperClient(helper.socket_path)
+
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(client.get_status("test.service"), timeout=0.02)
+
+            response = await client.start_service("test.service")
+            assert response["payload"]["operation"] == "started"
+            assert helper.connections == 2
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_pipelines_requests(self, helper):
+        """Test batched requests return ordered responses over one connection."""
+        client = SystemdHelperClient(helper.socket_path)
+
+        try:
+            names = ["a.service", "missing.service", "b.service"]
+            responses = await client.batch(
+                [{"command": "restartService", "payload": {"serviceName": n}} for n in names]
+            )
+
+            assert [r["status"] for r in responses] == ["success", "error", "success"]
+            assert "unit not found" in responses[1]["error"]
+            assert helper.connections == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stop_services_sends_one_request(self, helper, test_config):
+        """Test stopping several services is a single batchServices request."""
+        manager = SystemdManager(test_config)
+        manager.helper_client = SystemdHelperClient(helper.socket_path)
+
+        try:
+            names = ["a.service", "missing.service", "b.service"]
+            failed = await manager.stop_services(names)
+
+            assert failed == {"missing.service": "unit not found"}
+            assert helper.batches == [{"operation": "stop", "serviceNames": names}]
+            assert await manager.start_services([]) == {}
+        finally:
+            await manager.close()
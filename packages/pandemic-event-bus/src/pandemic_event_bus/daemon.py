@@ -1,6 +1,8 @@
+import asyncio
+import grp
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from pandemic_common import UnixDaemonServer, route
 
@@ -19,13 +21,17 @@ class EventDaemon(UnixDaemonServer):
         socket_mode: int = 660,
         socket_group: str = "pandemic",
         event_mode: int = 770,
+        batch_delay: float = 0.001,
     ):
         super().__init__(socket_path, socket_mode, socket_group=socket_group)
         self.events_dir = events_dir
         self.rate_limit = rate_limit
         self.burst_size = burst_size
         self.event_mode = event_mode
+        self.batch_delay = batch_delay
         self.sockets: Dict[str, EventSocket] = {}
+        self._gid: Optional[int] = None
+        self._events_dirfd: Optional[int] = None
 
     async def on_startup(self):
         """Initialize events directory and create core socket."""
@@ -33,17 +39,30 @@ class EventDaemon(UnixDaemonServer):
         events_path.mkdir(parents=True, exist_ok=True)
         os.chmod(self.events_dir, int(str(self.event_mode), 8))
 
+        # Resolve the socket group and directory handle once for every source
+        try:
+            self._gid = grp.getgrnam(self.socket_group).gr_gid
+        except KeyError:
+            self._gid = -1
+            self.logger.warning(f"Group '{self.socket_group}' not found, using default ownership")
+        self._events_dirfd = os.open(self.events_dir, os.O_RDONLY | os.O_DIRECTORY)
+
         await self._create_event_socket("core")
         self.logger.info("Event bus control plane started")
 
     async def on_shutdown(self):
         """Stop all event sockets."""
+        for socket in self.sockets.values():
+            socket.close()
+
         stop_tasks = [socket.stop() for socket in self.sockets.values()]
         if stop_tasks:
-            import asyncio
-
             await asyncio.gather(*stop_tasks, return_exceptions=True)
         self.sockets.clear()
+
+        if self._events_dirfd is not None:
+            os.close(self._events_dirfd)
+            self._events_dirfd = None
         self.logger.info("Event bus control plane stopped")
 
     @route("publish")
@@ -116,7 +135,14 @@ class EventDaemon(UnixDaemonServer):
             rate_limiter = RateLimiter(self.rate_limit, self.burst_size)
 
         event_socket = EventSocket(
-            socket_path, source_id, rate_limiter, self.socket_mode, self.socket_group
+            socket_path,
+            source_id,
+            rate_limiter,
+            self.socket_mode,
+            self.socket_group,
+            self.batch_delay,
+            socket_gid=self._gid,
+            dir_fd=self._events_dirfd,
         )
 
         await event_socket.start()
@@ -1,11 +1,16 @@
 """Pytest configuration and fixtures for event bus tests."""
 
-import asyncio
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pandemic_common.testing import configure_test_environment
+
+
+def pytest_configure(config):
+    """Apply the test environment shared by all pandemic packages."""
+    configure_test_environment()
 
 
 @pytest.fixture
@@ -38,11 +43,3 @@ def mock_event_socket():
     mock.stop = AsyncMock()
     mock.publish = AsyncMock()
     return mock
-
-
-@pytest.fixture
-def event_loop():
-    """Event loop fixture for async tests."""
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
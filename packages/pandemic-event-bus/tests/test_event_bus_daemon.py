@@ -32,6 +32,7 @@ class TestEventDaemon:
 
         await event_daemon.on_shutdown()
 
+        mock_event_socket.close.assert_called_once()
         mock_event_socket.stop.assert_called_once()
         assert len(event_daemon.sockets) == 0
 
@@ -199,7 +200,7 @@ class TestEventDaemonIntegration:
         with patch.object(event_daemon, "_create_event_socket", new_callable=AsyncMock):
             # Start daemon
             start_task = asyncio.create_task(event_daemon.start())
-            await asyncio.sleep(0.1)
+            await asyncio.wait_for(event_daemon.ready.wait(), timeout=2.0)
 
             assert event_daemon.running is True
 
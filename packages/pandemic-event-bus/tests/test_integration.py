@@ -18,7 +18,7 @@ class TestEventBusIntegration:
 
         # Start daemon
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
             # Connect as client
@@ -60,7 +60,7 @@ class TestEventBusIntegration:
         daemon = EventDaemon(socket_path=socket_path, events_dir=events_dir)
 
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
             reader, writer = await asyncio.open_unix_connection(socket_path)
@@ -93,7 +93,7 @@ class TestEventBusIntegration:
         daemon = EventDaemon(socket_path=socket_path, events_dir=events_dir)
 
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
             reader, writer = await asyncio.open_unix_connection(socket_path)
@@ -127,7 +127,7 @@ class TestEventBusIntegration:
         daemon = EventDaemon(socket_path=socket_path, events_dir=events_dir)
 
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         try:
             reader, writer = await asyncio.open_unix_connection(socket_path)
@@ -157,7 +157,7 @@ class TestEventBusIntegration:
         daemon = EventDaemon(socket_path=socket_path, events_dir=events_dir)
 
         start_task = asyncio.create_task(daemon.start())
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(daemon.ready.wait(), timeout=2.0)
 
         async def client_request(client_id):
             reader, writer = await asyncio.open_unix_connection(socket_path)
@@ -1,14 +1,25 @@
 import asyncio
 import json
 import os
+import shutil
 import subprocess
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from pandemic_common import UnixDaemonServer, route
 
+from .systemd_bus import SystemdBus
 from .validator import RequestValidator
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional speedup
+    _json_loads = json.loads
+
+# journald entries can carry large messages; allow lines well past the 64KiB default
+_JOURNAL_LINE_LIMIT = 1 << 20
+
 
 class HelperDaemon(UnixDaemonServer):
     """Privileged systemd helper daemon with integrated operations."""
@@ -21,12 +32,28 @@ class HelperDaemon(UnixDaemonServer):
     ):
         super().__init__(socket_path, socket_mode, socket_owner, socket_owner)
         self.validator = RequestValidator()
+        self.systemd_bus: Optional[SystemdBus] = None
 
     async def on_startup(self):
         """Startup validation."""
         if os.geteuid() != 0:
             raise RuntimeError("Helper daemon must run as root")
 
+        if SystemdBus.available():
+            bus = SystemdBus()
+            try:
+                await bus.connect()
+                self.systemd_bus = bus
+            except Exception as e:
+                bus.disconnect()
+                self.logger.warning(f"D-Bus unavailable, falling back to systemctl: {e}")
+
+    async def on_shutdown(self):
+        """Close the systemd bus connection."""
+        if self.systemd_bus:
+            self.systemd_bus.disconnect()
+            self.systemd_bus = None
+
     @route("createService")
     async def create_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Create systemd service with template and override."""
@@ -54,7 +81,7 @@ class HelperDaemon(UnixDaemonServer):
             self.logger.info(f"Created override config: {override_file}")
 
         # Reload systemd
-        await self._run_systemctl("daemon-reload")
+        await self._daemon_reload()
 
         return {"status": "success", "operation": "created"}
 
@@ -64,24 +91,21 @@ class HelperDaemon(UnixDaemonServer):
         service_name = payload["serviceName"]
         self.logger.info(f"Removing service: {service_name}")
 
-        # Stop and disable service first
-        await self._run_systemctl("stop", service_name)
-        await self._run_systemctl("disable", service_name)
+        # Stop and disable service first; the reload below picks up the change
+        await self._stop_unit(service_name)
+        await self._disable_units([service_name], reload=False)
 
         # Remove service file
-        service_path = Path(f"/etc/systemd/system/{service_name}")
-        if service_path.exists():
-            service_path.unlink()
+        Path(f"/etc/systemd/system/{service_name}").unlink(missing_ok=True)
 
         # Remove drop-in directory
-        drop_in_dir = Path(f"/etc/systemd/system/{service_name}.d")
-        if drop_in_dir.exists():
-            import shutil
-
-            shutil.rmtree(drop_in_dir)
+        try:
+            shutil.rmtree(f"/etc/systemd/system/{service_name}.d")
+        except FileNotFoundError:
+            pass
 
         # Reload systemd
-        await self._run_systemctl("daemon-reload")
+        await self._daemon_reload()
 
         return {"status": "success", "operation": "removed"}
 
@@ -89,28 +113,36 @@ class HelperDaemon(UnixDaemonServer):
     async def start_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Start systemd service."""
         service_name = payload["serviceName"]
-        await self._run_systemctl("start", service_name)
+        await self._start_unit(service_name)
         return {"status": "success", "operation": "started"}
 
     @route("stopService")
     async def stop_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Stop systemd service."""
         service_name = payload["serviceName"]
-        await self._run_systemctl("stop", service_name)
+        await self._stop_unit(service_name)
         return {"status": "success", "operation": "stopped"}
 
+    @route("restartService")
+    async def restart_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Restart systemd service in a single operation."""
+        self.validator.validate_request({"command": "restartService", "payload": payload})
+
+        await self._restart_unit(payload["serviceName"])
+        return {"status": "success", "operation": "restarted"}
+
     @route("enableService")
     async def enable_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Enable systemd service."""
         service_name = payload["serviceName"]
-        await self._run_systemctl("enable", service_name)
+        await self._enable_units([service_name])
         return {"status": "success", "operation": "enabled"}
 
     @route("disableService")
     async def disable_service(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Disable systemd service."""
         service_name = payload["serviceName"]
-        await self._run_systemctl("disable", service_name)
+        await self._disable_units([service_name])
         return {"status": "success", "operation": "disabled"}
 
     @route("getStatus")
@@ -118,22 +150,32 @@ class HelperDaemon(UnixDaemonServer):
         """Get systemd service status."""
         service_name = payload["serviceName"]
 
-        result = await self._run_systemctl(
-            "show", service_name, "--property=ActiveState,SubState,MainPID,MemoryCurrent"
+        properties = await self._show(
+            service_name,
+            [
+                "ActiveState",
+                "SubState",
+                "MainPID",
+                "MemoryCurrent",
+                "CPUUsageNSec",
+                "ActiveEnterTimestampMonotonic",
+            ],
         )
 
-        properties = {}
-        for line in result.stdout.strip().split("\n"):
-            if "=" in line:
-                key, value = line.split("=", 1)
-                properties[key] = value
+        active_state = properties.get("ActiveState", "unknown")
+        uptime_seconds = 0
+        entered_usec = properties.get("ActiveEnterTimestampMonotonic", "0")
+        if active_state == "active" and entered_usec.isdigit() and int(entered_usec):
+            uptime_seconds = max(0, time.monotonic_ns() // 1000 - int(entered_usec)) // 1_000_000
 
         return {
             "status": "success",
-            "activeState": properties.get("ActiveState", "unknown"),
+            "activeState": active_state,
             "subState": properties.get("SubState", "unknown"),
             "pid": int(properties.get("MainPID", 0)) or None,
             "memoryUsage": properties.get("MemoryCurrent", "0"),
+            "cpuUsageNSec": properties.get("CPUUsageNSec", "0"),
+            "uptimeSeconds": uptime_seconds,
         }
 
     @route("getLogs")
@@ -142,14 +184,19 @@ class HelperDaemon(UnixDaemonServer):
         service_name = payload["serviceName"]
         lines = payload.get("lines", 100)
 
-        result = await self._run_command(
-            "journalctl", "-u", service_name, "-n", str(lines), "--output=json"
+        args = ("journalctl", "-u", service_name, "-n", str(lines), "--output=json", "--no-pager")
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_JOURNAL_LINE_LIMIT,
         )
 
+        # Parse entries as journalctl emits them instead of buffering all output
         logs = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                log_entry = json.loads(line)
+        async for line in process.stdout:
+            if line.strip():
+                log_entry = _json_loads(line)
                 logs.append(
                     {
                         "timestamp": log_entry.get("__REALTIME_TIMESTAMP", ""),
@@ -158,27 +205,124 @@ class HelperDaemon(UnixDaemonServer):
                     }
                 )
 
+        stderr = await process.stderr.read()
+        returncode = await process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, None, stderr.decode())
+
         return {"status": "success", "logs": logs}
 
+    @route("batchServices")
+    async def batch_services(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one operation to several services in a single request.
+
+        Unit jobs run concurrently and failures are reported per service.
+        Enabling or disabling changes every unit file in one call.
+        """
+        self.validator.validate_request({"command": "batchServices", "payload": payload})
+
+        operation = payload["operation"]
+        service_names = payload["serviceNames"]
+        failed = {}
+
+        if operation == "enable":
+            await self._enable_units(service_names)
+        elif operation == "disable":
+            await self._disable_units(service_names)
+        else:
+            action = {
+                "start": self._start_unit,
+                "stop": self._stop_unit,
+                "restart": self._restart_unit,
+            }[operation]
+            outcomes = await asyncio.gather(
+                *(action(name) for name in service_names), return_exceptions=True
+            )
+            for service_name, outcome in zip(service_names, outcomes):
+                if isinstance(outcome, Exception):
+                    failed[service_name] = str(outcome)
+
+        return {"status": "success", "operation": operation, "failed": failed}
+
+    async def _start_unit(self, service_name: str):
+        """Start a unit over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.start_unit(service_name)
+        else:
+            await self._run_systemctl("start", service_name)
+
+    async def _stop_unit(self, service_name: str):
+        """Stop a unit over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.stop_unit(service_name)
+        else:
+            await self._run_systemctl("stop", service_name)
+
+    async def _restart_unit(self, service_name: str):
+        """Restart a unit over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.restart_unit(service_name)
+        else:
+            await self._run_systemctl("restart", service_name)
+
+    async def _enable_units(self, service_names: List[str]):
+        """Enable units over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.enable_unit_files(service_names)
+            await self.systemd_bus.reload()
+        else:
+            await self._run_systemctl("enable", *service_names)
+
+    async def _disable_units(self, service_names: List[str], reload: bool = True):
+        """Disable units over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.disable_unit_files(service_names)
+            if reload:
+                await self.systemd_bus.reload()
+        else:
+            await self._run_systemctl("disable", *service_names)
+
+    async def _daemon_reload(self):
+        """Reload unit files over D-Bus when connected, otherwise via systemctl."""
+        if self.systemd_bus:
+            await self.systemd_bus.reload()
+        else:
+            await self._run_systemctl("daemon-reload")
+
+    async def _show(self, service_name: str, properties: List[str]) -> Dict[str, str]:
+        """Read unit properties in a single D-Bus batch or systemctl invocation."""
+        if self.systemd_bus:
+            return await self.systemd_bus.show(service_name, properties)
+
+        result = await self._run_systemctl(
+            "show", service_name, f"--property={','.join(properties)}"
+        )
+
+        # Split the raw bytes rather than decoding the whole buffer first
+        values = {}
+        for line in result.stdout.splitlines():
+            key, sep, value = line.partition(b"=")
+            if sep:
+                values[key.decode()] = value.decode()
+        return values
+
     async def _run_systemctl(self, *args) -> subprocess.CompletedProcess:
         """Run systemctl command."""
         return await self._run_command("systemctl", *args)
 
     async def _run_command(self, *args) -> subprocess.CompletedProcess:
-        """Run command asynchronously."""
+        """Run command asynchronously, leaving stdout as bytes for the caller to parse."""
         process = await asyncio.create_subprocess_exec(
             *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
         )
 
         stdout, stderr = await process.communicate()
 
-        result = subprocess.CompletedProcess(
-            args, process.returncode or 0, stdout.decode(), stderr.decode()
-        )
+        result = subprocess.CompletedProcess(args, process.returncode or 0, stdout, stderr)
 
         if result.returncode != 0:
             raise subprocess.CalledProcessError(
-                result.returncode, args, result.stdout, result.stderr
+                result.returncode, args, result.stdout, result.stderr.decode(errors="replace")
             )
 
         return result
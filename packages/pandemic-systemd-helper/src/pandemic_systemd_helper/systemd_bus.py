@@ -0,0 +1,182 @@
+"""Direct D-Bus access to the systemd manager."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+try:
+    from dbus_next import BusType, Message, MessageType
+    from dbus_next.aio import MessageBus
+except ImportError:  # pragma: no cover - optional backend
+    MessageBus = None
+
+SYSTEMD_BUS_NAME = "org.freedesktop.systemd1"
+SYSTEMD_PATH = "/org/freedesktop/systemd1"
+MANAGER_INTERFACE = "org.freedesktop.systemd1.Manager"
+UNIT_INTERFACE = "org.freedesktop.systemd1.Unit"
+SERVICE_INTERFACE = "org.freedesktop.systemd1.Service"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+# systemd reports unset accounting values as UINT64_MAX
+_UINT64_MAX = 2**64 - 1
+_MAX_UNCLAIMED_JOBS = 256
+
+
+class SystemdBus:
+    """Persistent connection to systemd replacing per-call systemctl processes.
+
+    Unit start/stop calls wait for the queued job to finish, matching the
+    blocking behaviour of ``systemctl start``/``stop``.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._bus: Optional["MessageBus"] = None
+        self._jobs: Dict[str, asyncio.Future] = {}
+        self._finished: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the D-Bus backend is installed."""
+        return MessageBus is not None
+
+    async def connect(self):
+        """Connect to the system bus and subscribe to job completion signals."""
+        if self._bus is not None:
+            return
+
+        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        bus.add_message_handler(self._on_message)
+        self._bus = bus
+
+        await self._call(
+            "/org/freedesktop/DBus",
+            "org.freedesktop.DBus",
+            "AddMatch",
+            "s",
+            [
+                f"type='signal',sender='{SYSTEMD_BUS_NAME}',"
+                f"interface='{MANAGER_INTERFACE}',member='JobRemoved'"
+            ],
+            destination="org.freedesktop.DBus",
+        )
+        await self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "Subscribe")
+        self.logger.info("Connected to systemd over D-Bus")
+
+    def disconnect(self):
+        """Close the bus connection and fail any waiting jobs."""
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+
+        jobs, self._jobs = self._jobs, {}
+        for future in jobs.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Disconnected from systemd"))
+
+    async def start_unit(self, name: str):
+        """Start a unit and wait for the job to complete."""
+        await self._run_job("StartUnit", name)
+
+    async def stop_unit(self, name: str):
+        """Stop a unit and wait for the job to complete."""
+        await self._run_job("StopUnit", name)
+
+    async def restart_unit(self, name: str):
+        """Restart a unit and wait for the job to complete."""
+        await self._run_job("RestartUnit", name)
+
+    async def enable_unit_files(self, names: List[str]):
+        """Enable unit files persistently; call :meth:`reload` afterwards."""
+        await self._call(
+            SYSTEMD_PATH, MANAGER_INTERFACE, "EnableUnitFiles", "asbb", [names, False, False]
+        )
+
+    async def disable_unit_files(self, names: List[str]):
+        """Disable unit files persistently; call :meth:`reload` afterwards."""
+        await self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "DisableUnitFiles", "asb", [names, False])
+
+    async def reload(self):
+        """Reload unit files, like ``systemctl daemon-reload``."""
+        await self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "Reload")
+
+    async def show(self, name: str, properties: List[str]) -> Dict[str, str]:
+        """Read unit and service properties, formatted like ``systemctl show``."""
+        [unit_path] = await self._call(SYSTEMD_PATH, MANAGER_INTERFACE, "LoadUnit", "s", [name])
+
+        values: Dict[str, Any] = {}
+        for interface in (UNIT_INTERFACE, SERVICE_INTERFACE):
+            [variants] = await self._call(
+                unit_path, PROPERTIES_INTERFACE, "GetAll", "s", [interface]
+            )
+            values.update((key, variant.value) for key, variant in variants.items())
+
+        result = {}
+        for key in properties:
+            if key in values:
+                value = values[key]
+                result[key] = "[not set]" if value == _UINT64_MAX else str(value)
+        return result
+
+    async def _run_job(self, method: str, name: str):
+        """Queue a unit job and wait for systemd to report its result."""
+        [job_path] = await self._call(
+            SYSTEMD_PATH, MANAGER_INTERFACE, method, "ss", [name, "replace"]
+        )
+
+        result = self._finished.pop(job_path, None)
+        if result is None:
+            future = asyncio.get_running_loop().create_future()
+            self._jobs[job_path] = future
+            try:
+                result = await future
+            finally:
+                self._jobs.pop(job_path, None)
+
+        if result != "done":
+            raise RuntimeError(f"Job for {name} finished with result: {result}")
+
+    async def _call(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: Optional[List[Any]] = None,
+        destination: str = SYSTEMD_BUS_NAME,
+    ) -> List[Any]:
+        """Send a method call and return the reply body."""
+        if self._bus is None:
+            raise ConnectionError("Not connected to systemd")
+
+        reply = await self._bus.call(
+            Message(
+                destination=destination,
+                path=path,
+                interface=interface,
+                member=member,
+                signature=signature,
+                body=body or [],
+            )
+        )
+        if reply.message_type == MessageType.ERROR:
+            raise RuntimeError(f"{member} failed: {reply.error_name}: {reply.body}")
+        return reply.body
+
+    def _on_message(self, message) -> None:
+        """Resolve waiting jobs from JobRemoved signals."""
+        if message.member != "JobRemoved" or message.interface != MANAGER_INTERFACE:
+            return
+
+        _job_id, job_path, _unit, result = message.body
+        future = self._jobs.get(job_path)
+        if future is not None:
+            if not future.done():
+                future.set_result(result)
+            return
+
+        # The signal can arrive before the caller has registered interest
+        self._finished[job_path] = result
+        if len(self._finished) > _MAX_UNCLAIMED_JOBS:
+            self._finished.popitem(last=False)
@@ -14,11 +14,15 @@ class RequestValidator:
         "removeService",
         "startService",
         "stopService",
+        "restartService",
         "enableService",
         "disableService",
         "getStatus",
         "getLogs",
+        "batchServices",
     }
+    BATCH_OPERATIONS = {"start", "stop", "restart", "enable", "disable"}
+    MAX_BATCH_SIZE = 256
     MAX_CONTENT_SIZE = 64 * 1024  # 64KB
 
     def validate_request(self, request: Dict[str, Any]) -> None:
@@ -40,6 +44,7 @@ class RequestValidator:
             "removeService",
             "startService",
             "stopService",
+            "restartService",
             "enableService",
             "disableService",
             "getStatus",
@@ -50,6 +55,9 @@ class RequestValidator:
         if command == "createService":
             self._validate_create_service(payload)
 
+        if command == "batchServices":
+            self._validate_batch_services(payload)
+
     def _validate_service_name(self, service_name: str) -> None:
         """Validate service name matches allowed pattern."""
         if not service_name or not isinstance(service_name, str):
@@ -58,6 +66,22 @@ class RequestValidator:
         if not self.ALLOWED_SERVICE_PATTERN.match(service_name):
             raise ValueError(f"Invalid service name: {service_name}")
 
+    def _validate_batch_services(self, payload: Dict[str, Any]) -> None:
+        """Validate batchServices payload."""
+        operation = payload.get("operation")
+        if operation not in self.BATCH_OPERATIONS:
+            raise ValueError(f"Invalid batch operation: {operation}")
+
+        service_names = payload.get("serviceNames")
+        if not service_names or not isinstance(service_names, list):
+            raise ValueError("Service names are required")
+
+        if len(service_names) > self.MAX_BATCH_SIZE:
+            raise ValueError("Too many services in batch")
+
+        for service_name in service_names:
+            self._validate_service_name(service_name)
+
     def _validate_create_service(self, payload: Dict[str, Any]) -> None:
         """Validate createService payload."""
         template_content = payload.get("templateContent", "")
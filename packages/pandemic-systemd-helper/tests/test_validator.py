@@ -22,6 +22,42 @@ class TestRequestValidator:
         # Should not raise exception
         validator.validate_request(request)
 
+    def test_validate_restart_request(self, validator):
+        """Test restartService is allowed and checks the service name."""
+        request = {
+            "command": "restartService",
+            "payload": {"serviceName": "pandemic-infection@test.service"},
+        }
+        validator.validate_request(request)
+
+        with pytest.raises(ValueError, match="Invalid service name"):
+            validator.validate_request(
+                {"command": "restartService", "payload": {"serviceName": "sshd.service"}}
+            )
+
+    def test_validate_batch_request(self, validator):
+        """Test batchServices checks the operation and every service name."""
+        names = ["pandemic-infection@a.service", "pandemic-infection@b.service"]
+        validator.validate_request(
+            {"command": "batchServices", "payload": {"operation": "stop", "serviceNames": names}}
+        )
+
+        with pytest.raises(ValueError, match="Invalid batch operation"):
+            validator.validate_request(
+                {
+                    "command": "batchServices",
+                    "payload": {"operation": "mask", "serviceNames": names},
+                }
+            )
+
+        with pytest.raises(ValueError, match="Invalid service name"):
+            validator.validate_request(
+                {
+                    "command": "batchServices",
+                    "payload": {"operation": "start", "serviceNames": names + ["sshd.service"]},
+                }
+            )
+
     def test_validate_invalid_command(self, validator):
         """Test invalid command rejection."""
         request = {